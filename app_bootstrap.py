@@ -0,0 +1,62 @@
+"""
+Shared start-up for the command-line entry points (main.py, main_1.py)
+Sets up logging, the database and (for long-running modes) Drive prefetch, and reports pipeline results
+"""
+import sys
+from typing import Callable
+from loguru import logger
+import config
+from database import init_db
+
+LOG_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>"
+
+# Sink ids registered so far, so calling setup_logging again is a no-op
+_sink_ids = {}
+
+def setup_logging(log_stem: str):
+    """Configure logging to stdout and a daily-rotated file named after log_stem"""
+    config.ensure_dirs()
+    if "stdout" not in _sink_ids:
+        logger.remove()  # Remove default handler
+        _sink_ids["stdout"] = logger.add(sys.stdout, format=LOG_FORMAT, level="INFO", enqueue=True)
+    if log_stem not in _sink_ids:
+        _sink_ids[log_stem] = logger.add(
+            config.LOGS_DIR / f"{log_stem}_{{time}}.log",
+            rotation="1 day",
+            retention="30 days",
+            level="DEBUG",
+            enqueue=True
+        )
+
+def bootstrap(log_stem: str, prefetch: bool = False):
+    """Set up logging and the database, and optionally start warming Drive assets"""
+    setup_logging(log_stem)
+
+    # Initialize database
+    logger.info("Initializing database...")
+    init_db()
+    logger.info("Database initialized")
+
+    # Start pulling Drive assets while the rest of the run gets going; one-shot runs skip this,
+    # since they only use one file per folder and the prefetch would download several
+    if prefetch and config.DRIVE_FOLDERS:
+        from google_drive_assets import drive_assets
+        drive_assets.start_prefetch()
+
+def run_pipeline(pipeline_factory: Callable, name: str, **run_kwargs) -> dict:
+    """Run a pipeline once, log its outcome and exit non-zero on failure"""
+    result = pipeline_factory().run(**run_kwargs)
+
+    if result["status"] == "success":
+        logger.info(f"{name} completed successfully")
+        logger.info(f"Post ID: {result.get('post_id')}")
+        logger.info(f"Publish results: {result.get('publish_results', {})}")
+        if result.get("warnings"):
+            logger.warning(f"Warnings: {result.get('warnings', [])}")
+    else:
+        logger.error(f"{name} failed")
+        logger.error(f"Errors: {result.get('errors', [])}")
+        if result.get("warnings"):
+            logger.warning(f"Warnings: {result.get('warnings', [])}")
+        sys.exit(1)
+    return result
@@ -2,11 +2,20 @@
 Configuration management for the Social Media Agent
 """
 import os
+import functools
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 
+@functools.lru_cache(maxsize=1)
+def _load_env():
+    """Load environment variables from .env (once per process)"""
+    load_dotenv()
+    return True
+
 # Load environment variables
-load_dotenv()
+_load_env()
 
 # Base paths
 BASE_DIR = Path(__file__).parent
@@ -17,69 +26,188 @@ ASSETS_DIR = BASE_DIR / "assets"
 BACKGROUNDS_DIR = ASSETS_DIR / "backgrounds"
 FONTS_DIR = ASSETS_DIR / "fonts"
 AUDIO_DIR = ASSETS_DIR / "audio"
-
-# Create directories if they don't exist
-DATA_DIR.mkdir(exist_ok=True)
-MEDIA_DIR.mkdir(exist_ok=True)
-LOGS_DIR.mkdir(exist_ok=True)
-ASSETS_DIR.mkdir(exist_ok=True)
-BACKGROUNDS_DIR.mkdir(exist_ok=True)
-FONTS_DIR.mkdir(exist_ok=True)
-AUDIO_DIR.mkdir(exist_ok=True)
-
+LLM_CACHE_DIR = DATA_DIR / "llm_cache"
+CACHE_DIR = DATA_DIR / "cache"
+
+def ensure_dirs():
+    """Create data, log and asset directories if they don't exist (called from entry points, not at import)"""
+    for directory in (DATA_DIR, MEDIA_DIR, LOGS_DIR, ASSETS_DIR, BACKGROUNDS_DIR, FONTS_DIR, AUDIO_DIR, LLM_CACHE_DIR, CACHE_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Typed settings read from the environment once at startup"""
+    # News API Configuration
+    news_api_key: str
+    gnews_api_key: str
+    
+    # LLM Configuration
+    openai_api_key: str
+    anthropic_api_key: str
+    groq_api_key: str
+    huggingface_api_key: str
+    together_api_key: str
+    openrouter_api_key: str
+    llm_provider: str
+    llm_model: str
+    llm_cache_ttl_seconds: int
+    
+    # Meta API Configuration
+    facebook_app_id: str
+    facebook_app_secret: str
+    facebook_access_token: str
+    instagram_business_account_id: str
+    facebook_page_id: str
+    
+    # YouTube API Configuration
+    youtube_client_id: str
+    youtube_client_secret: str
+    youtube_refresh_token: str
+    
+    # Scheduling Configuration
+    post_times: Tuple[str, ...]
+    timezone: str
+    
+    # Media Generation Configuration
+    tts_provider: str
+    use_hwaccel: bool
+    x264_preset: str
+    bulletin_x264_preset: str
+    bulletin_crf: int
+    
+    # Database Configuration
+    database_url: str
+    
+    # Monitoring Configuration
+    enable_notifications: bool
+    telegram_bot_token: str
+    telegram_chat_id: str
+    
+    # Retry Configuration
+    max_retries: int
+    retry_delay_seconds: int
+    
+    # Google Drive Assets
+    drive_audio_folder_id: str
+    drive_backgrounds_folder_id: str
+    drive_cache_max_bytes: int
+
+CONFIG = Config(
+    news_api_key=os.getenv("NEWS_API_KEY", ""),
+    gnews_api_key=os.getenv("GNEWS_API_KEY", ""),
+    openai_api_key=os.getenv("OPENAI_API_KEY", ""),
+    anthropic_api_key=os.getenv("ANTHROPIC_API_KEY", ""),
+    # Free LLM Options
+    groq_api_key=os.getenv("GROQ_API_KEY", ""),
+    huggingface_api_key=os.getenv("HUGGINGFACE_API_KEY", ""),
+    together_api_key=os.getenv("TOGETHER_API_KEY", ""),
+    openrouter_api_key=os.getenv("OPENROUTER_API_KEY", ""),
+    llm_provider=os.getenv("LLM_PROVIDER", "groq"),  # Default to free Groq
+    # Model defaults for each provider (Updated Nov 2025)
+    # Best models for social media content generation:
+    # - llama-3.3-70b-versatile: Latest, best quality (if available)
+    # - llama-3.1-70b-versatile: High quality, reliable
+    # - llama-3.1-8b-instant: Fast, good quality (default - best balance)
+    llm_model=os.getenv("LLM_MODEL", "llama-3.1-8b-instant"),  # Default: Fast and reliable
+    # Generated content is cached per article so retries/re-runs skip the LLM call
+    llm_cache_ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+    facebook_app_id=os.getenv("FACEBOOK_APP_ID", ""),
+    facebook_app_secret=os.getenv("FACEBOOK_APP_SECRET", ""),
+    facebook_access_token=os.getenv("FACEBOOK_ACCESS_TOKEN", ""),
+    instagram_business_account_id=os.getenv("INSTAGRAM_BUSINESS_ACCOUNT_ID", ""),
+    facebook_page_id=os.getenv("FACEBOOK_PAGE_ID", ""),
+    youtube_client_id=os.getenv("YOUTUBE_CLIENT_ID", ""),
+    youtube_client_secret=os.getenv("YOUTUBE_CLIENT_SECRET", ""),
+    youtube_refresh_token=os.getenv("YOUTUBE_REFRESH_TOKEN", ""),
+    post_times=tuple(os.getenv("POST_TIMES", "09:00,14:00,20:00").split(",")),
+    timezone=os.getenv("TIMEZONE", "Asia/Kolkata"),
+    tts_provider=os.getenv("TTS_PROVIDER", "gtts"),
+    # Decode background videos on an NVIDIA GPU when one is usable
+    use_hwaccel=os.getenv("USE_HWACCEL", "true").lower() == "true",
+    # libx264 speed/size trade-off when no hardware encoder is available (e.g. fast, veryfast)
+    x264_preset=os.getenv("X264_PRESET", "medium"),
+    # Bulletin Shorts are short and re-encoded by YouTube, so favor encode speed at constant quality
+    bulletin_x264_preset=os.getenv("BULLETIN_X264_PRESET", "veryfast"),
+    bulletin_crf=int(os.getenv("BULLETIN_CRF", "23")),
+    database_url=os.getenv("DATABASE_URL", f"sqlite:///{DATA_DIR}/social_media_agent.db"),
+    enable_notifications=os.getenv("ENABLE_NOTIFICATIONS", "true").lower() == "true",
+    telegram_bot_token=os.getenv("TELEGRAM_BOT_TOKEN", ""),
+    telegram_chat_id=os.getenv("TELEGRAM_CHAT_ID", ""),
+    max_retries=int(os.getenv("MAX_RETRIES", "3")),
+    retry_delay_seconds=int(os.getenv("RETRY_DELAY_SECONDS", "60")),
+    drive_audio_folder_id=os.getenv("DRIVE_AUDIO_FOLDER_ID", ""),
+    drive_backgrounds_folder_id=os.getenv("DRIVE_BACKGROUNDS_FOLDER_ID", ""),
+    # Downloaded Drive assets beyond this total are evicted least-recently-used first (0 = no limit)
+    drive_cache_max_bytes=int(os.getenv("DRIVE_CACHE_MAX_BYTES", str(2 * 1024 ** 3))),
+)
+
+# Module-level aliases (kept for existing `config.NAME` callers)
 # News API Configuration
-NEWS_API_KEY = os.getenv("NEWS_API_KEY", "")
-GNEWS_API_KEY = os.getenv("GNEWS_API_KEY", "")
+NEWS_API_KEY = CONFIG.news_api_key
+GNEWS_API_KEY = CONFIG.gnews_api_key
 
 # LLM Configuration
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
-# Free LLM Options
-GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
-HUGGINGFACE_API_KEY = os.getenv("HUGGINGFACE_API_KEY", "")
-TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY", "")
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
-
-LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")  # Default to free Groq
-# Model defaults for each provider (Updated Nov 2025)
-# Best models for social media content generation:
-# - llama-3.3-70b-versatile: Latest, best quality (if available)
-# - llama-3.1-70b-versatile: High quality, reliable
-# - llama-3.1-8b-instant: Fast, good quality (default - best balance)
-LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.1-8b-instant")  # Default: Fast and reliable
+OPENAI_API_KEY = CONFIG.openai_api_key
+ANTHROPIC_API_KEY = CONFIG.anthropic_api_key
+GROQ_API_KEY = CONFIG.groq_api_key
+HUGGINGFACE_API_KEY = CONFIG.huggingface_api_key
+TOGETHER_API_KEY = CONFIG.together_api_key
+OPENROUTER_API_KEY = CONFIG.openrouter_api_key
+LLM_PROVIDER = CONFIG.llm_provider
+LLM_MODEL = CONFIG.llm_model
+LLM_CACHE_TTL_SECONDS = CONFIG.llm_cache_ttl_seconds
 
 # Meta API Configuration
-FACEBOOK_APP_ID = os.getenv("FACEBOOK_APP_ID", "")
-FACEBOOK_APP_SECRET = os.getenv("FACEBOOK_APP_SECRET", "")
-FACEBOOK_ACCESS_TOKEN = os.getenv("FACEBOOK_ACCESS_TOKEN", "")
-INSTAGRAM_BUSINESS_ACCOUNT_ID = os.getenv("INSTAGRAM_BUSINESS_ACCOUNT_ID", "")
-FACEBOOK_PAGE_ID = os.getenv("FACEBOOK_PAGE_ID", "")
+FACEBOOK_APP_ID = CONFIG.facebook_app_id
+FACEBOOK_APP_SECRET = CONFIG.facebook_app_secret
+FACEBOOK_ACCESS_TOKEN = CONFIG.facebook_access_token
+INSTAGRAM_BUSINESS_ACCOUNT_ID = CONFIG.instagram_business_account_id
+FACEBOOK_PAGE_ID = CONFIG.facebook_page_id
 
 # YouTube API Configuration
-YOUTUBE_CLIENT_ID = os.getenv("YOUTUBE_CLIENT_ID", "")
-YOUTUBE_CLIENT_SECRET = os.getenv("YOUTUBE_CLIENT_SECRET", "")
-YOUTUBE_REFRESH_TOKEN = os.getenv("YOUTUBE_REFRESH_TOKEN", "")
+YOUTUBE_CLIENT_ID = CONFIG.youtube_client_id
+YOUTUBE_CLIENT_SECRET = CONFIG.youtube_client_secret
+YOUTUBE_REFRESH_TOKEN = CONFIG.youtube_refresh_token
 
 # Scheduling Configuration
-POST_TIMES = os.getenv("POST_TIMES", "09:00,14:00,20:00").split(",")
-TIMEZONE = os.getenv("TIMEZONE", "Asia/Kolkata")
+POST_TIMES: Tuple[str, ...] = CONFIG.post_times
+TIMEZONE = CONFIG.timezone
 
 # Media Generation Configuration
-TTS_PROVIDER = os.getenv("TTS_PROVIDER", "gtts")
+TTS_PROVIDER = CONFIG.tts_provider
+USE_HWACCEL = CONFIG.use_hwaccel
+X264_PRESET = CONFIG.x264_preset
+BULLETIN_X264_PRESET = CONFIG.bulletin_x264_preset
+BULLETIN_CRF = CONFIG.bulletin_crf
 BACKGROUND_VIDEO_PATH = BACKGROUNDS_DIR
 FONT_PATH = FONTS_DIR / "arial.ttf"
+FONT_PATH_EXISTS = FONT_PATH.exists()  # Validated once at startup
+
+@functools.lru_cache(maxsize=16)
+def get_font(size: int, font_path: Optional[str] = None):
+    """Get a parsed TrueType font (cached per path/size so the TTF is only read once per process)"""
+    from PIL import ImageFont
+    
+    if font_path is None:
+        if not FONT_PATH_EXISTS:
+            return ImageFont.load_default()
+        font_path = str(FONT_PATH)
+    try:
+        return ImageFont.truetype(font_path, size)
+    except Exception:
+        return ImageFont.load_default()
 
 # Database Configuration
-DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DATA_DIR}/social_media_agent.db")
+DATABASE_URL = CONFIG.database_url
 
 # Monitoring Configuration
-ENABLE_NOTIFICATIONS = os.getenv("ENABLE_NOTIFICATIONS", "true").lower() == "true"
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
-TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
+ENABLE_NOTIFICATIONS = CONFIG.enable_notifications
+TELEGRAM_BOT_TOKEN = CONFIG.telegram_bot_token
+TELEGRAM_CHAT_ID = CONFIG.telegram_chat_id
 
 # Retry Configuration
-MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
-RETRY_DELAY_SECONDS = int(os.getenv("RETRY_DELAY_SECONDS", "60"))
+MAX_RETRIES = CONFIG.max_retries
+RETRY_DELAY_SECONDS = CONFIG.retry_delay_seconds
 
 # Video Configuration
 VIDEO_WIDTH = 1080
@@ -97,5 +225,16 @@ MAX_NEWS_AGE_HOURS = 12
 
 # Google Drive Assets (Optional - for cloud storage of large files)
 # Extract ID from URL: drive.google.com/drive/folders/YOUR_ID_HERE
-DRIVE_AUDIO_FOLDER_ID = os.getenv("DRIVE_AUDIO_FOLDER_ID", "")
-DRIVE_BACKGROUNDS_FOLDER_ID = os.getenv("DRIVE_BACKGROUNDS_FOLDER_ID", "")
+DRIVE_AUDIO_FOLDER_ID = CONFIG.drive_audio_folder_id
+DRIVE_BACKGROUNDS_FOLDER_ID = CONFIG.drive_backgrounds_folder_id
+DRIVE_CACHE_MAX_BYTES = CONFIG.drive_cache_max_bytes
+
+# Drive folders warmed at startup: (folder_id, local_dir, extensions)
+DRIVE_FOLDERS = tuple(
+    spec for spec in (
+        (DRIVE_BACKGROUNDS_FOLDER_ID, str(BACKGROUNDS_DIR), ['.mp4', '.mov']),
+        (DRIVE_AUDIO_FOLDER_ID, str(AUDIO_DIR), ['.mp3', '.wav', '.m4a']),
+    )
+    if spec[0]
+)
+DRIVE_PREFETCH_PER_FOLDER = 3
@@ -5,102 +5,135 @@ Generates scripts, captions, and hashtags for social media posts
 from typing import Dict, Optional
 from loguru import logger
 import config
+import atexit
+import functools
+import hashlib
+import io
 import json
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-class ContentGenerator:
-    """Generate content using LLM APIs"""
-    
-    def __init__(self):
-        self.provider = config.LLM_PROVIDER
-        self.model = config.LLM_MODEL
-        self.api_key = getattr(config, f"{self.provider.upper()}_API_KEY", "")
-        
-        if self.provider == "openai":
-            try:
-                import openai
-                self.client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
-            except ImportError:
-                logger.error("OpenAI library not installed")
-                self.client = None
-        elif self.provider == "anthropic":
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared keep-alive session for the HTTP-based providers (Groq, Together, OpenRouter, Hugging Face)
+# Reusing pooled connections avoids a fresh TCP+TLS handshake on every generation
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=Retry(total=0)))
+atexit.register(_SESSION.close)
+
+# Precompiled patterns used when parsing LLM responses and splitting scripts
+_JSON_BLOCK_RE = re.compile(r'\{.*\}', re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_SENT_SPLIT_RE = re.compile(r'[.!?]+')
+
+def _json_body(response) -> Dict:
+    """Decode a JSON response body straight from bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def _dumps(obj) -> bytes:
+    """Serialize to compact JSON bytes (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def _error_snippet(response, limit: int = 200) -> str:
+    """Read only the first bytes of an error body for logging, without charset detection"""
+    return response.raw.read(limit, decode_content=True).decode("utf-8", errors="replace")
+
+def _read_sse_content(response) -> str:
+    """Join the content deltas of an OpenAI-compatible server-sent-events stream"""
+    buffer = io.StringIO()
+    for line in response.iter_lines():
+        if not line or not line.startswith(b"data:"):
+            continue
+        payload = line[5:].strip()
+        if payload == b"[DONE]":
+            break
+        event = orjson.loads(payload) if orjson is not None else json.loads(payload)
+        choices = event.get("choices") or []
+        delta = choices[0].get("delta", {}).get("content") if choices else None
+        if delta:
+            buffer.write(delta)
+    logger.debug("LLM stream: {} chars received", buffer.tell())
+    return buffer.getvalue()
+
+@functools.lru_cache(maxsize=1)
+def _prune_content_cache():
+    """Delete expired content cache entries and leftover temp files (once per process)"""
+    cutoff = time.time() - config.LLM_CACHE_TTL_SECONDS
+    removed = 0
+    for pattern in ("*.json", "*.tmp"):
+        for path in config.LLM_CACHE_DIR.glob(pattern):
             try:
-                import anthropic
-                self.client = anthropic.Anthropic(api_key=config.ANTHROPIC_API_KEY)
-            except ImportError:
-                logger.error("Anthropic library not installed")
-                self.client = None
-        elif self.provider == "groq":
-            # Groq - Free tier, very fast
-            self.client = "groq"
-        elif self.provider == "huggingface":
-            # Hugging Face Inference API - Free tier
-            self.client = "huggingface"
-        elif self.provider == "together":
-            # Together AI - Free tier available
-            self.client = "together"
-        elif self.provider == "openrouter":
-            # OpenRouter - Free models available
-            self.client = "openrouter"
-        else:
-            self.client = None
-            logger.warning(f"Unknown LLM provider: {self.provider}")
-    
-    def generate_content(self, news_title: str, news_description: str, news_url: str) -> Dict:
-        """Generate complete content package for a news article"""
-        logger.info(f"Generating content for: {news_title[:50]}...")
-        
-        prompt = self._create_prompt(news_title, news_description, news_url)
-        
-        try:
-            if self.provider == "openai":
-                response = self._call_openai(prompt)
-            elif self.provider == "anthropic":
-                response = self._call_anthropic(prompt)
-            elif self.provider == "groq":
-                response = self._call_groq(prompt)
-            elif self.provider == "huggingface":
-                response = self._call_huggingface(prompt)
-            elif self.provider == "together":
-                response = self._call_together(prompt)
-            elif self.provider == "openrouter":
-                response = self._call_openrouter(prompt)
-            else:
-                logger.error("No valid LLM provider configured")
-                return self._fallback_content(news_title, news_description)
-            
-            # Parse response
-            content = self._parse_response(response)
-            logger.info("Content generated successfully")
-            return content
-            
-        except Exception as e:
-            logger.error(f"Error generating content: {e}")
-            return self._fallback_content(news_title, news_description)
-    
-    def _create_prompt(self, title: str, description: str, url: str) -> str:
-        """Create prompt for LLM"""
-        return f"""You are a social media content creator specializing in viral news content for short-form video platforms (Instagram Reels, YouTube Shorts, TikTok).
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError as e:
+                logger.debug(f"Could not prune content cache entry {path.name}: {e}")
+    if removed:
+        logger.info(f"Pruned {removed} expired content cache entries")
+    return True
 
-Given this news article, create engaging content:
+# Translation table for stripping control characters in one pass (tabs/newlines become spaces)
+_CTRL_TABLE = dict.fromkeys(range(32))
+_CTRL_TABLE.update({ord('\n'): ' ', ord('\r'): ' ', ord('\t'): ' '})
 
-Title: {title}
-Description: {description}
-Source URL: {url}
+# Groq endpoint and model fallbacks (Groq model names may vary)
+# Updated Nov 2025: Best models for content generation
+_GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+_GROQ_MODELS = (
+    "llama-3.1-8b-instant",  # Fast, good quality (default)
+    "llama-3.3-70b-versatile",  # Latest 70B model (best quality if available)
+    "llama-3.1-70b-versatile",  # Previous 70B model (fallback)
+    "llama-3-70b-8192",  # Stable 70B model
+    "mixtral-8x7b-32768",  # Mixtral model (alternative)
+    "gemma2-9b-it"  # Google Gemma 2 (if available)
+)
+
+# Number of Groq fallback models raced in parallel before trying the rest one by one
+_GROQ_PARALLEL_MODELS = 3
+# Head start for the configured Groq model before the fallbacks join the race
+_GROQ_HEDGE_DELAY_SECONDS = 1.5
+
+# Hugging Face responses above this size are logged (low-RAM deployments)
+_HF_LARGE_RESPONSE_BYTES = 1_000_000
+
+# Hashtags used when the LLM is unavailable
+_FALLBACK_HASHTAGS = ("news", "breaking", "trending", "viral", "update")
+
+# System instruction shared by every provider
+_SYSTEM_PROMPT = "You are an expert social media content creator. Always respond with valid JSON only."
+
+# Static part of the content prompt, identical for every article and placed before the article details.
+# At ~640 tokens it is below the 1024-token minimum of OpenAI's automatic prefix caching and of
+# Anthropic's cache_control, so neither provider caches it; the ordering only keeps the prompt stable.
+_STATIC_PROMPT_PREFIX = """You are a social media content creator specializing in viral news content for short-form video platforms (Instagram Reels, YouTube Shorts, TikTok).
 
 Please provide a JSON response with the following structure:
-{{
+{
     "hook": "A compelling 1-2 line hook that grabs attention immediately (max 100 characters)",
     "script": "A complete 40-45 second script for a vertical video. Break it into natural pauses. Make it engaging, informative, and suitable for text-to-speech. (300-400 words)",
     "on_screen_text": [
-        {{"text": "First text overlay", "duration": 2.5, "start_time": 0.0}},
-        {{"text": "Second text overlay", "duration": 3.0, "start_time": 2.5}},
+        {"text": "First text overlay", "duration": 2.5, "start_time": 0.0},
+        {"text": "Second text overlay", "duration": 3.0, "start_time": 2.5},
         ...
     ],
     "caption": "A platform-agnostic caption (100-150 characters) that summarizes the story",
     "hashtags": ["hashtag1", "hashtag2", "hashtag3", ...],
     "title": "A catchy title for YouTube (max 100 characters, include #Shorts)"
-}}
+}
 
 Requirements:
 - Hook must be attention-grabbing and make people want to watch (3-4 seconds)
@@ -125,37 +158,180 @@ CRITICAL: For on_screen_text, calculate start_time and duration based on word po
 - If "today" appears at word 2-3, start_time should be 0.8 (2 words / 2.5 words per second)
 - Duration should match the number of words: word_count / 2.5
 
+"""
+
+@functools.lru_cache(maxsize=8)
+def _get_client(provider: str, api_key_hash: str):
+    """Get a shared SDK client per provider/key (keyed by key hash, never the plaintext key)"""
+    api_key = getattr(config, f"{provider.upper()}_API_KEY", "")
+    if provider == "openai":
+        try:
+            import openai
+            return openai.OpenAI(api_key=api_key)
+        except ImportError:
+            logger.error("OpenAI library not installed")
+            return None
+    elif provider == "anthropic":
+        try:
+            import anthropic
+            return anthropic.Anthropic(api_key=api_key)
+        except ImportError:
+            logger.error("Anthropic library not installed")
+            return None
+    return None
+
+class ContentGenerator:
+    """Generate content using LLM APIs"""
+    
+    def __init__(self):
+        self.provider = config.LLM_PROVIDER
+        self.model = config.LLM_MODEL
+        self.api_key = getattr(config, f"{self.provider.upper()}_API_KEY", "")
+        
+        # Provider -> call method, built once so generate_content can dispatch with a dict lookup
+        self._dispatch = {
+            "openai": self._call_openai,
+            "anthropic": self._call_anthropic,
+            "groq": self._call_groq,  # Free tier, very fast
+            "huggingface": self._call_huggingface,  # Inference API - Free tier
+            "together": self._call_together,  # Free tier available
+            "openrouter": self._call_openrouter  # Free models available
+        }
+        
+        if self.provider in ("openai", "anthropic"):
+            key_hash = hashlib.sha256(self.api_key.encode()).hexdigest()
+            self.client = _get_client(self.provider, key_hash)
+        elif self.provider in self._dispatch:
+            # HTTP-based providers share the module-level session
+            self.client = self.provider
+        else:
+            self.client = None
+            logger.warning(f"Unknown LLM provider: {self.provider}")
+    
+    def close(self):
+        """Close pooled HTTP connections"""
+        _SESSION.close()
+    
+    def generate_content(self, news_title: str, news_description: str, news_url: str, ignore_cache: bool = False) -> Dict:
+        """Generate complete content package for a news article"""
+        logger.info(f"Generating content for: {news_title[:50]}...")
+        
+        # Reuse a previous generation for the same article (retries, re-runs, crash recovery)
+        cache_key = self._cache_key(news_title, news_url)
+        if not ignore_cache:
+            cached = self._load_cached_content(cache_key)
+            if cached:
+                logger.info("Using cached content for this article")
+                return cached
+        
+        prompt = self._create_prompt(news_title, news_description, news_url)
+        
+        try:
+            caller = self._dispatch.get(self.provider)
+            if caller is None:
+                logger.error("No valid LLM provider configured")
+                return self._fallback_content(news_title, news_description)
+            response = caller(prompt)
+            
+            # Parse response
+            content = self._parse_response(response)
+            logger.info("Content generated successfully")
+            self._save_cached_content(cache_key, content)
+            return content
+            
+        except Exception as e:
+            logger.error(f"Error generating content: {e}")
+            return self._fallback_content(news_title, news_description)
+    
+    def _cache_key(self, title: str, url: str) -> str:
+        """Build the response cache key for an article"""
+        return hashlib.sha256(f"{self.provider}|{self.model}|{title}|{url}".encode()).hexdigest()
+    
+    def _load_cached_content(self, cache_key: str) -> Optional[Dict]:
+        """Load cached content if present and not expired"""
+        cache_path = config.LLM_CACHE_DIR / f"{cache_key}.json"
+        try:
+            if time.time() - cache_path.stat().st_mtime > config.LLM_CACHE_TTL_SECONDS:
+                cache_path.unlink(missing_ok=True)
+                return None
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Could not read content cache: {e}")
+            return None
+    
+    def _save_cached_content(self, cache_key: str, content: Dict):
+        """Store generated content in the response cache"""
+        try:
+            _prune_content_cache()
+            cache_path = config.LLM_CACHE_DIR / f"{cache_key}.json"
+            tmp_path = cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(content, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.debug(f"Could not write content cache: {e}")
+    
+    def _create_prompt(self, title: str, description: str, url: str) -> str:
+        """Create prompt for LLM (static instructions first, article details last)"""
+        return _STATIC_PROMPT_PREFIX + f"""Given this news article, create engaging content:
+
+Title: {title}
+Description: {description}
+Source URL: {url}
+
 Return ONLY valid JSON, no additional text."""
+    
+    def _split_prompt(self, prompt: str):
+        """Split a prompt into its static instructions and the per-article suffix"""
+        if prompt.startswith(_STATIC_PROMPT_PREFIX):
+            return _STATIC_PROMPT_PREFIX, prompt[len(_STATIC_PROMPT_PREFIX):]
+        return "", prompt
 
     def _call_openai(self, prompt: str) -> str:
         """Call OpenAI API"""
         if not self.client:
             raise Exception("OpenAI client not initialized")
         
-        response = self.client.chat.completions.create(
+        # Static instructions go in the system message, article details in the user message
+        static_prefix, dynamic_prompt = self._split_prompt(prompt)
+        stream = self.client.chat.completions.create(
             model=self.model,
             messages=[
-                {"role": "system", "content": "You are an expert social media content creator. Always respond with valid JSON only."},
-                {"role": "user", "content": prompt}
+                {"role": "system", "content": f"{_SYSTEM_PROMPT}\n\n{static_prefix}".rstrip()},
+                {"role": "user", "content": dynamic_prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            stream=True
         )
         
-        return response.choices[0].message.content
+        # Collect streamed deltas as they arrive instead of waiting for the full completion
+        buffer = io.StringIO()
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                buffer.write(chunk.choices[0].delta.content)
+        logger.debug("OpenAI stream: {} chars received", buffer.tell())
+        
+        return buffer.getvalue()
     
     def _call_anthropic(self, prompt: str) -> str:
         """Call Anthropic API"""
         if not self.client:
             raise Exception("Anthropic client not initialized")
         
+        # Static instructions go in the system prompt, article details in the user message
+        static_prefix, dynamic_prompt = self._split_prompt(prompt)
+        
         response = self.client.messages.create(
             model=self.model,
             max_tokens=2000,
             temperature=0.7,
-            system="You are an expert social media content creator. Always respond with valid JSON only.",
+            system=f"{_SYSTEM_PROMPT}\n\n{static_prefix}".rstrip(),
             messages=[
-                {"role": "user", "content": prompt}
+                {"role": "user", "content": dynamic_prompt}
             ]
         )
         
@@ -164,59 +340,66 @@ Return ONLY valid JSON, no additional text."""
     def _call_groq(self, prompt: str) -> str:
         """Call Groq API (Free tier, very fast)"""
         try:
-            import requests
-            
             api_key = config.GROQ_API_KEY
             if not api_key:
                 raise Exception("GROQ_API_KEY not configured")
             
-            # Try different model names (Groq model names may vary)
-            # Updated Nov 2025: Best models for content generation
-            models_to_try = [
-                self.model or "llama-3.1-8b-instant",  # Fast, good quality (default)
-                "llama-3.3-70b-versatile",  # Latest 70B model (best quality if available)
-                "llama-3.1-70b-versatile",  # Previous 70B model (fallback)
-                "llama-3-70b-8192",  # Stable 70B model
-                "mixtral-8x7b-32768",  # Mixtral model (alternative)
-                "gemma2-9b-it"  # Google Gemma 2 (if available)
-            ]
+            # Configured model first, then the fallbacks (duplicates dropped, order kept)
+            models_to_try = list(dict.fromkeys((self.model or _GROQ_MODELS[0],) + _GROQ_MODELS))
             
-            url = "https://api.groq.com/openai/v1/chat/completions"
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json"
             }
             
+            # Serialize the request (including the long prompt) once; only "model" differs per attempt
+            base_data = {
+                "messages": [
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": 0.7,
+                "max_tokens": 2000,
+                "stream": True
+            }
+            payload_tail = _dumps(base_data)[1:]  # Everything after the opening "{"
+            
+            # Race the first few models so a rate-limited/down model doesn't cost a full timeout
+            # before failing over; the remaining models are only tried sequentially if all of these fail.
+            # The first model whose request is accepted (200) takes `claim` and is the only one streamed
+            head, tail = models_to_try[:_GROQ_PARALLEL_MODELS], models_to_try[_GROQ_PARALLEL_MODELS:]
+            claim = threading.Lock()
             last_error = None
-            for model in models_to_try:
-                try:
-                    data = {
-                        "model": model,
-                        "messages": [
-                            {"role": "system", "content": "You are an expert social media content creator. Always respond with valid JSON only."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        "temperature": 0.7,
-                        "max_tokens": 2000
-                    }
-                    
-                    response = requests.post(url, json=data, headers=headers, timeout=60)
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        logger.info(f"Groq API success with model: {model}")
-                        return result["choices"][0]["message"]["content"]
+            executor = ThreadPoolExecutor(max_workers=len(head))
+            try:
+                futures = {executor.submit(self._try_groq_model, headers, head[0], payload_tail, claim): head[0]}
+                # The configured model gets a head start; fallbacks join only if it fails or is slow to be accepted
+                wait(futures, timeout=_GROQ_HEDGE_DELAY_SECONDS)
+                if not claim.locked():
+                    futures.update({executor.submit(self._try_groq_model, headers, model, payload_tail, claim): model
+                                    for model in head[1:]})
+                else:
+                    # The configured model was accepted early; its fallbacks only run if its stream fails
+                    tail = head[1:] + tail
+                cancelled = []
+                for future in as_completed(futures):
+                    content, error = future.result()
+                    if content is not None:
+                        return content
+                    if error == "cancelled":
+                        # Turned away while another model held the claim, which then failed
+                        cancelled.append(futures[future])
                     else:
-                        error_text = response.text[:200]
-                        logger.warning(f"Groq API error with model {model}: {response.status_code} - {error_text}")
-                        last_error = f"{response.status_code}: {error_text}"
-                        # Try next model
-                        continue
-                        
-                except requests.exceptions.RequestException as e:
-                    last_error = str(e)
-                    logger.warning(f"Groq API request error with model {model}: {e}")
-                    continue
+                        last_error = error
+                tail = cancelled + tail
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+            
+            for model in tail:
+                content, error = self._try_groq_model(headers, model, payload_tail)
+                if content is not None:
+                    return content
+                last_error = error
             
             # If all models failed, raise the last error
             raise Exception(f"Groq API failed with all models. Last error: {last_error}")
@@ -229,11 +412,47 @@ Return ONLY valid JSON, no additional text."""
                 logger.error(f"Response text: {e.response.text[:500]}")
             raise
     
+    def _try_groq_model(self, headers: Dict, model: str, payload_tail: bytes,
+                        claim: Optional[threading.Lock] = None):
+        """Try a single Groq model; returns (content, None) on success or (None, error)"""
+        if claim is not None and claim.locked():
+            return None, "cancelled"
+        
+        try:
+            body = b'{"model":' + _dumps(model) + b',' + payload_tail
+            
+            with _SESSION.post(_GROQ_URL, data=body, headers=headers, timeout=60, stream=True) as response:
+                if response.status_code == 200:
+                    # Commit to the first accepted model as soon as its status arrives; the others
+                    # drop their connections unread, so only one completion is generated
+                    if claim is not None and not claim.acquire(blocking=False):
+                        return None, "cancelled"
+                    try:
+                        content = _read_sse_content(response)
+                    except (requests.exceptions.RequestException, ValueError):
+                        # Hand the claim back so another accepted model can still take over
+                        if claim is not None:
+                            claim.release()
+                        raise
+                    if not content:
+                        if claim is not None:
+                            claim.release()
+                        logger.warning(f"Groq API returned an empty stream with model {model}")
+                        return None, "empty response"
+                    logger.info(f"Groq API success with model: {model}")
+                    return content, None
+                error_text = _error_snippet(response)
+                logger.warning(f"Groq API error with model {model}: {response.status_code} - {error_text}")
+                return None, f"{response.status_code}: {error_text}"
+                
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError covers a malformed stream event (orjson/json decode errors)
+            logger.warning(f"Groq API request error with model {model}: {e}")
+            return None, str(e)
+    
     def _call_huggingface(self, prompt: str) -> str:
         """Call Hugging Face Inference API (Free tier)"""
         try:
-            import requests
-            
             api_key = getattr(config, "HUGGINGFACE_API_KEY", "")
             model = self.model or "mistralai/Mistral-7B-Instruct-v0.2"
             
@@ -243,7 +462,7 @@ Return ONLY valid JSON, no additional text."""
             }
             
             # Format prompt for Hugging Face
-            formatted_prompt = f"You are an expert social media content creator. Always respond with valid JSON only.\n\n{prompt}"
+            formatted_prompt = f"{_SYSTEM_PROMPT}\n\n{prompt}"
             
             data = {
                 "inputs": formatted_prompt,
@@ -254,13 +473,19 @@ Return ONLY valid JSON, no additional text."""
                 }
             }
             
-            response = requests.post(url, json=data, headers=headers, timeout=120)
-            response.raise_for_status()
-            result = response.json()
+            with _SESSION.post(url, json=data, headers=headers, timeout=120, stream=True) as response:
+                response.raise_for_status()
+                raw = response.content
+            
+            if len(raw) > _HF_LARGE_RESPONSE_BYTES:
+                logger.warning(f"Hugging Face returned a large response ({len(raw)} bytes)")
+            result = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             # Handle different response formats
-            if isinstance(result, list) and len(result) > 0:
-                return result[0].get("generated_text", "")
+            if isinstance(result, list):
+                first = result[0] if result else None
+                if isinstance(first, dict):
+                    return first.get("generated_text", "")
             elif isinstance(result, dict):
                 return result.get("generated_text", "")
             return str(result)
@@ -272,8 +497,6 @@ Return ONLY valid JSON, no additional text."""
     def _call_together(self, prompt: str) -> str:
         """Call Together AI API (Free tier available)"""
         try:
-            import requests
-            
             api_key = getattr(config, "TOGETHER_API_KEY", "")
             if not api_key:
                 raise Exception("TOGETHER_API_KEY not configured")
@@ -286,16 +509,17 @@ Return ONLY valid JSON, no additional text."""
             data = {
                 "model": self.model or "mistralai/Mixtral-8x7B-Instruct-v0.1",
                 "messages": [
-                    {"role": "system", "content": "You are an expert social media content creator. Always respond with valid JSON only."},
+                    {"role": "system", "content": _SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 "temperature": 0.7,
-                "max_tokens": 2000
+                "max_tokens": 2000,
+                "stream": True
             }
             
-            response = requests.post(url, json=data, headers=headers, timeout=60)
-            response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
+            with _SESSION.post(url, json=data, headers=headers, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                return _read_sse_content(response)
             
         except Exception as e:
             logger.error(f"Together AI API error: {e}")
@@ -304,8 +528,6 @@ Return ONLY valid JSON, no additional text."""
     def _call_openrouter(self, prompt: str) -> str:
         """Call OpenRouter API (Free models available)"""
         try:
-            import requests
-            
             api_key = getattr(config, "OPENROUTER_API_KEY", "")
             if not api_key:
                 raise Exception("OPENROUTER_API_KEY not configured")
@@ -320,16 +542,16 @@ Return ONLY valid JSON, no additional text."""
             data = {
                 "model": self.model or "google/gemini-flash-1.5",  # Free model
                 "messages": [
-                    {"role": "system", "content": "You are an expert social media content creator. Always respond with valid JSON only."},
+                    {"role": "system", "content": _SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 "temperature": 0.7,
                 "max_tokens": 2000
             }
             
-            response = requests.post(url, json=data, headers=headers, timeout=60)
-            response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
+            with _SESSION.post(url, json=data, headers=headers, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                return _json_body(response)["choices"][0]["message"]["content"]
             
         except Exception as e:
             logger.error(f"OpenRouter API error: {e}")
@@ -338,7 +560,7 @@ Return ONLY valid JSON, no additional text."""
     def _parse_response(self, response_text: str) -> Dict:
         """Parse LLM response into structured content"""
         # Try to extract JSON from response
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+        json_match = _JSON_BLOCK_RE.search(response_text)
         if json_match:
             json_str = json_match.group(0)
         else:
@@ -346,21 +568,15 @@ Return ONLY valid JSON, no additional text."""
         
         # Clean JSON string more aggressively
         # Remove control characters that break JSON parsing
-        json_str = json_str.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
-        # Remove any other control characters except spaces
-        json_str = ''.join(char for char in json_str if ord(char) >= 32 or char == ' ')
-        
-        # Fix common JSON issues:
-        # 1. Remove trailing commas before } or ]
-        json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
+        # (newlines/tabs become spaces, any other control characters are dropped)
+        json_str = json_str.translate(_CTRL_TABLE)
         
-        # 2. Try to fix unescaped quotes in string values
-        # This is tricky - we'll use a simpler approach: try to parse, and if it fails, try to fix common issues
-        # First, try to find and fix unescaped newlines in strings
-        json_str = re.sub(r':\s*"([^"]*)"', lambda m: f': "{m.group(1).replace(chr(10), " ").replace(chr(13), " ")}"', json_str)
+        # Fix common JSON issues: remove trailing commas before } or ]
+        # (unescaped newlines inside string values are already handled by the translate above)
+        json_str = _TRAILING_COMMA_RE.sub(r'\1', json_str)
         
         try:
-            content = json.loads(json_str)
+            content = self._loads(json_str)
             
             # Validate and clean
             if "on_screen_text" not in content:
@@ -382,6 +598,15 @@ Return ONLY valid JSON, no additional text."""
             logger.debug(f"Response text: {response_text[:500]}")
             raise
     
+    def _loads(self, json_str: str):
+        """Decode JSON with orjson when available, falling back to the stdlib parser"""
+        if orjson is not None:
+            try:
+                return orjson.loads(json_str)
+            except orjson.JSONDecodeError:
+                pass  # stdlib is more lenient (e.g. NaN) and gives the canonical error
+        return json.loads(json_str)
+    
     def _fallback_content(self, title: str, description: str) -> Dict:
         """Generate fallback content if LLM fails"""
         logger.warning("Using fallback content generation")
@@ -389,8 +614,8 @@ Return ONLY valid JSON, no additional text."""
         # Simple fallback
         hook = f"Breaking: {title[:80]}"
         script = f"Here's what you need to know. {description[:200]}. Stay informed. Follow for more updates."
-        caption = title[:100] if len(title) <= 100 else title[:97] + "..."
-        hashtags = ["news", "breaking", "trending", "viral", "update"]
+        caption = (title[:97] + "...") if len(title) > 100 else title
+        hashtags = list(_FALLBACK_HASHTAGS)
         
         return {
             "hook": hook,
@@ -406,27 +631,26 @@ Return ONLY valid JSON, no additional text."""
     
     def split_script_into_segments(self, script: str, target_duration: int = 45) -> list:
         """Split script into timed segments for on-screen text"""
-        sentences = re.split(r'[.!?]+', script)
+        sentences = _SENT_SPLIT_RE.split(script)
         sentences = [s.strip() for s in sentences if s.strip()]
+        if not sentences:
+            return []
         
-        segments = []
-        current_time = 0
         words_per_second = 2.5  # Average speaking rate
         
-        for sentence in sentences:
-            word_count = len(sentence.split())
-            duration = max(2, min(5, int(word_count / words_per_second)))
-            
-            segments.append({
-                "text": sentence[:100],  # Limit text length
-                "duration": duration,
-                "start_time": current_time
-            })
-            
-            current_time += duration
-            
-            if current_time >= target_duration:
-                break
+        # Compute all durations/start times at once: 2-5 seconds per sentence, cumulative starts
+        word_counts = np.fromiter((len(s.split()) for s in sentences), dtype=np.int32, count=len(sentences))
+        durations = np.clip((word_counts / words_per_second).astype(np.int32), 2, 5)
+        start_times = np.concatenate(([0], np.cumsum(durations)[:-1]))
         
-        return segments
-
+        # Keep sentences until the running time reaches the target (the segment crossing it is kept)
+        count = max(1, int(np.count_nonzero(start_times < target_duration)))
+        
+        return [
+            {
+                "text": sentence[:100],  # Limit text length
+                "duration": int(duration),
+                "start_time": int(start_time)
+            }
+            for sentence, duration, start_time in zip(sentences[:count], durations[:count], start_times[:count])
+        ]
@@ -1,89 +1,156 @@
 """
 Database models and session management
 """
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy import create_engine, event, text, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Index
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, scoped_session, sessionmaker, relationship
+from sqlalchemy.pool import QueuePool
+from contextlib import contextmanager
 from datetime import datetime
+from typing import List, Optional
+from loguru import logger
 import config
 
-Base = declarative_base()
+class Base(DeclarativeBase):
+    pass
 
 class NewsItem(Base):
     """Stores fetched news articles"""
     __tablename__ = "news_items"
     
-    id = Column(Integer, primary_key=True)
-    title = Column(String(500), nullable=False)
-    description = Column(Text)
-    url = Column(String(1000), nullable=False)
-    source = Column(String(200))
-    published_at = Column(DateTime, nullable=False)
-    fetched_at = Column(DateTime, default=datetime.utcnow)
-    score = Column(Float, default=0.0)
-    used_in_post = Column(Boolean, default=False)
-    used_at = Column(DateTime, nullable=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    url: Mapped[str] = mapped_column(String(1000), nullable=False, index=True, unique=True)
+    source: Mapped[Optional[str]] = mapped_column(String(200))
+    published_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    fetched_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    score: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
+    used_in_post: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, index=True)
+    used_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Relationship
-    posts = relationship("Post", back_populates="news_item")
+    posts: Mapped[List["Post"]] = relationship(back_populates="news_item")
 
 class Post(Base):
     """Stores generated posts"""
     __tablename__ = "posts"
     
-    id = Column(Integer, primary_key=True)
-    news_id = Column(Integer, ForeignKey("news_items.id"))
-    script = Column(Text, nullable=False)
-    caption = Column(String(500))
-    hashtags = Column(String(500))
-    video_path = Column(String(1000))
-    thumbnail_path = Column(String(1000))
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    news_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("news_items.id"))
+    script: Mapped[str] = mapped_column(Text, nullable=False)
+    caption: Mapped[Optional[str]] = mapped_column(String(500))
+    hashtags: Mapped[Optional[str]] = mapped_column(String(500))
+    video_path: Mapped[Optional[str]] = mapped_column(String(1000))
+    thumbnail_path: Mapped[Optional[str]] = mapped_column(String(1000))
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    news_item = relationship("NewsItem", back_populates="posts")
-    publish_logs = relationship("PublishLog", back_populates="post")
+    news_item: Mapped[Optional["NewsItem"]] = relationship(back_populates="posts")
+    publish_logs: Mapped[List["PublishLog"]] = relationship(back_populates="post")
 
 class PublishLog(Base):
     """Stores publishing status for each platform"""
     __tablename__ = "publish_logs"
+    __table_args__ = (Index("ix_publish_post_platform", "post_id", "platform"),)
     
-    id = Column(Integer, primary_key=True)
-    post_id = Column(Integer, ForeignKey("posts.id"))
-    platform = Column(String(50), nullable=False)  # instagram, youtube, facebook
-    status = Column(String(50), nullable=False)  # success, failed, pending
-    response = Column(Text)
-    posted_at = Column(DateTime, nullable=True)
-    error_message = Column(Text)
-    retry_count = Column(Integer, default=0)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    post_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("posts.id"), index=True)
+    platform: Mapped[str] = mapped_column(String(50), nullable=False, index=True)  # instagram, youtube, facebook
+    status: Mapped[str] = mapped_column(String(50), nullable=False)  # success, failed, pending
+    response: Mapped[Optional[str]] = mapped_column(Text)
+    posted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text)
+    retry_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
     
     # Relationship
-    post = relationship("Post", back_populates="publish_logs")
+    post: Mapped[Optional["Post"]] = relationship(back_populates="publish_logs")
 
 class SystemLog(Base):
     """Stores system-level logs and errors"""
     __tablename__ = "system_logs"
     
-    id = Column(Integer, primary_key=True)
-    level = Column(String(20), nullable=False)  # info, warning, error
-    message = Column(Text, nullable=False)
-    component = Column(String(100))  # news_service, content_generator, etc.
-    created_at = Column(DateTime, default=datetime.utcnow)
-    log_metadata = Column(Text)  # JSON string for additional data (renamed from metadata to avoid SQLAlchemy conflict)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    level: Mapped[str] = mapped_column(String(20), nullable=False)  # info, warning, error
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    component: Mapped[Optional[str]] = mapped_column(String(100))  # news_service, content_generator, etc.
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    log_metadata: Mapped[Optional[str]] = mapped_column(Text)  # JSON string for additional data (renamed from metadata to avoid SQLAlchemy conflict)
 
 # Database setup
-engine = create_engine(config.DATABASE_URL, echo=False)
+if config.DATABASE_URL.startswith("sqlite"):
+    # Pooled connections shared across scheduler/publisher threads
+    engine = create_engine(
+        config.DATABASE_URL,
+        echo=False,
+        poolclass=QueuePool,
+        pool_size=5,
+        max_overflow=10,
+        connect_args={"check_same_thread": False, "timeout": 30},
+        insertmanyvalues_page_size=1000
+    )
+    
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragma(dbapi_conn, _):
+        """Enable WAL so writes don't block readers, and relax fsync for faster inserts"""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+else:
+    engine = create_engine(config.DATABASE_URL, echo=False, insertmanyvalues_page_size=1000)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionScoped = scoped_session(SessionLocal)
 
 def init_db():
     """Initialize database tables"""
+    config.ensure_dirs()
     Base.metadata.create_all(bind=engine)
+    _create_missing_indexes()
 
-def get_db():
-    """Get database session"""
-    db = SessionLocal()
+def _create_missing_indexes():
+    """Add indexes to tables created before they were declared (create_all skips existing tables)"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                if not index.unique:
+                    logger.warning(f"Could not create index {index.name}: {e}")
+                    continue
+                # Existing duplicate rows block a UNIQUE index; still index the column for lookups
+                logger.warning(f"Could not create unique index {index.name} ({e}), creating it non-unique")
+                _create_plain_index(index)
+
+def _create_plain_index(index: Index):
+    """Create a non-unique version of an index (same name and columns)"""
+    preparer = engine.dialect.identifier_preparer
+    columns = ", ".join(preparer.quote(column.name) for column in index.columns)
     try:
-        yield db
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {preparer.quote(index.name)} "
+                f"ON {preparer.format_table(index.table)} ({columns})"
+            ))
+    except Exception as e:
+        logger.warning(f"Could not create index {index.name}: {e}")
+
+@contextmanager
+def db_session():
+    """Thread-local session that commits on success, rolls back on error and is always released"""
+    session = SessionScoped()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
     finally:
-        db.close()
+        SessionScoped.remove()
+
+def get_db():
+    """Get database session (generator wrapper around db_session, kept for compatibility)"""
+    with db_session() as db:
+        yield db
 
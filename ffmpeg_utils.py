@@ -0,0 +1,227 @@
+"""
+FFmpeg helpers shared by the video generators
+Detects usable hardware encoders (once per process) and runs small ffmpeg jobs outside MoviePy
+"""
+import functools
+import subprocess
+from typing import List, Optional, Tuple
+from loguru import logger
+
+# Render node used for Intel/AMD VAAPI encoding
+VAAPI_DEVICE = "/dev/dri/renderD128"
+
+@functools.lru_cache(maxsize=1)
+def ffmpeg_binary() -> str:
+    """Path of the ffmpeg executable MoviePy is configured to use"""
+    from moviepy.config import get_setting
+    return get_setting("FFMPEG_BINARY")
+
+@functools.lru_cache(maxsize=1)
+def _encoder_listing() -> bytes:
+    """Output of `ffmpeg -encoders`"""
+    try:
+        return subprocess.run(
+            [ffmpeg_binary(), "-hide_banner", "-encoders"],
+            capture_output=True, timeout=15
+        ).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Could not list ffmpeg encoders: {e}")
+        return b""
+
+@functools.lru_cache(maxsize=8)
+def has_encoder(name: str) -> bool:
+    """Whether ffmpeg can actually encode with the named encoder here"""
+    if name.encode() not in _encoder_listing():
+        return False
+    # Hardware encoders are compiled into most builds even without the device, so try a tiny encode
+    try:
+        probe = subprocess.run(
+            [ffmpeg_binary(), "-hide_banner", "-loglevel", "error",
+             "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+             "-c:v", name, "-f", "null", "-"],
+            capture_output=True, timeout=30
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"Encoder probe for {name} failed: {e}")
+        return False
+    available = probe.returncode == 0
+    logger.info(f"Encoder {name} {'available' if available else 'not usable'}")
+    return available
+
+def has_nvenc() -> bool:
+    """Whether NVIDIA's h264_nvenc encoder is usable"""
+    return has_encoder("h264_nvenc")
+
+def vaapi_params() -> list:
+    """ffmpeg output options that upload frames to the VAAPI device for h264_vaapi"""
+    return ["-init_hw_device", f"vaapi=va:{VAAPI_DEVICE}", "-filter_hw_device", "va",
+            "-vf", "format=nv12,hwupload"]
+
+@functools.lru_cache(maxsize=1)
+def has_vaapi() -> bool:
+    """Whether the h264_vaapi encoder works on VAAPI_DEVICE"""
+    import os
+    if not os.path.exists(VAAPI_DEVICE) or b"h264_vaapi" not in _encoder_listing():
+        return False
+    # Unlike NVENC, VAAPI needs frames uploaded to the device, so probe with the same options used for encoding
+    try:
+        probe = subprocess.run(
+            [ffmpeg_binary(), "-hide_banner", "-loglevel", "error",
+             "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+             *vaapi_params(), "-c:v", "h264_vaapi", "-f", "null", "-"],
+            capture_output=True, timeout=30
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"VAAPI probe failed: {e}")
+        return False
+    available = probe.returncode == 0
+    logger.info(f"Encoder h264_vaapi {'available' if available else 'not usable'}")
+    return available
+
+@functools.lru_cache(maxsize=1)
+def has_cuda_decode() -> bool:
+    """Whether ffmpeg can open a CUDA device for hardware decoding"""
+    try:
+        probe = subprocess.run(
+            [ffmpeg_binary(), "-hide_banner", "-loglevel", "error",
+             "-init_hw_device", "cuda=gpu",
+             "-f", "lavfi", "-i", "color=c=black:s=64x64:d=0.1",
+             "-f", "null", "-"],
+            capture_output=True, timeout=30
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"CUDA device probe failed: {e}")
+        return False
+    available = probe.returncode == 0
+    logger.info(f"CUDA decoding {'available' if available else 'not usable'}")
+    return available
+
+def enable_hwaccel_decode():
+    """Make MoviePy's video reader decode on the GPU (NVDEC) with -hwaccel cuda"""
+    import os
+    from moviepy.video.io import ffmpeg_reader
+
+    reader_cls = ffmpeg_reader.FFMPEG_VideoReader
+    if getattr(reader_cls, "_hwaccel_enabled", False):
+        return
+
+    def initialize(self, starttime=0):
+        """Opens the file, creates the pipe (same as MoviePy's, with -hwaccel cuda before -i)"""
+        self.close()  # if any
+
+        if starttime != 0:
+            offset = min(1, starttime)
+            i_arg = ['-ss', "%.06f" % (starttime - offset),
+                     '-i', self.filename,
+                     '-ss', "%.06f" % offset]
+        else:
+            i_arg = ['-i', self.filename]
+
+        # Frames come back to system memory for the rawvideo pipe; ffmpeg falls back to
+        # software decoding on its own for codecs the GPU can't handle
+        cmd = ([ffmpeg_binary(), '-hwaccel', 'cuda'] + i_arg +
+               ['-loglevel', 'error',
+                '-f', 'image2pipe',
+                '-vf', 'scale=%d:%d' % tuple(self.size),
+                '-sws_flags', self.resize_algo,
+                "-pix_fmt", self.pix_fmt,
+                '-vcodec', 'rawvideo', '-'])
+        popen_params = {"bufsize": self.bufsize,
+                        "stdout": subprocess.PIPE,
+                        "stderr": subprocess.PIPE,
+                        "stdin": subprocess.DEVNULL}
+        if os.name == "nt":
+            popen_params["creationflags"] = 0x08000000
+
+        self.proc = subprocess.Popen(cmd, **popen_params)
+
+    reader_cls.initialize = initialize
+    reader_cls._hwaccel_enabled = True
+    logger.info("Using CUDA hardware decoding for video inputs")
+
+def stream_loop(input_path: str, duration: float, output_path: str) -> bool:
+    """Write input_path looped to `duration` seconds without re-encoding (False if ffmpeg fails)"""
+    try:
+        result = subprocess.run(
+            [ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error",
+             "-stream_loop", "-1", "-i", input_path,
+             "-t", f"{duration:.3f}", "-c", "copy", output_path],
+            capture_output=True, timeout=120
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"ffmpeg stream loop failed: {e}")
+        return False
+    if result.returncode != 0:
+        logger.warning(f"ffmpeg stream loop failed: {result.stderr.decode(errors='ignore')[-200:]}")
+        return False
+    return True
+
+def scale_video_cuda(input_path: str, width: int, height: int, output_path: str, duration: Optional[float] = None) -> bool:
+    """Resize a video entirely on the GPU (NVDEC -> scale_cuda -> NVENC), only its first `duration` seconds if given; False if that fails"""
+    # Only the part that will be used is transcoded
+    limit = ["-t", f"{duration:.3f}"] if duration else []
+    try:
+        result = subprocess.run(
+            [ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error",
+             "-hwaccel", "cuda", "-hwaccel_output_format", "cuda", *limit, "-i", input_path,
+             "-vf", f"scale_cuda={width}:{height}",
+             "-c:v", "h264_nvenc", "-preset", "p4", "-b:v", "6000k", "-an", output_path],
+            capture_output=True, timeout=300
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"CUDA scaling failed: {e}")
+        return False
+    if result.returncode != 0:
+        logger.warning(f"CUDA scaling failed: {result.stderr.decode(errors='ignore')[-200:]}")
+        return False
+    return True
+
+def mux_copy(video_path: str, audio_path: str, output_path: str, duration: float, loop_audio: bool = False) -> bool:
+    """Combine a video track (copied as-is) with an audio track, cut to `duration` (looping the audio if asked)"""
+    audio_input = (["-stream_loop", "-1"] if loop_audio else []) + ["-i", audio_path]
+    try:
+        result = subprocess.run(
+            [ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error",
+             "-i", video_path, *audio_input,
+             "-map", "0:v:0", "-map", "1:a:0",
+             "-c:v", "copy", "-c:a", "aac", "-t", f"{duration:.3f}",
+             "-movflags", "+faststart", output_path],
+            capture_output=True, timeout=300
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"ffmpeg mux failed: {e}")
+        return False
+    if result.returncode != 0:
+        logger.warning(f"ffmpeg mux failed: {result.stderr.decode(errors='ignore')[-200:]}")
+        return False
+    return True
+
+def overlay_video(background_path: str, start: float, overlay_path: str, audio_path: str, output_path: str,
+                  size: Tuple[int, int], duration: float, fps: int, fade_in: float, codec_args: List[str],
+                  speed: float = 1.0, loop: bool = False) -> bool:
+    """Composite a still RGBA overlay (fading in from black) onto a background video and add looped audio, in one ffmpeg run"""
+    width, height = size
+    graph = (f"[0:v]setpts=(PTS-STARTPTS)/{speed:.6f},scale={width}:{height},setsar=1,fps={fps}[bg];"
+             f"[1:v]format=rgba,split[fgc][fga];[fga]alphaextract[alpha];"
+             # Fade only the colour planes (from black) and keep the alpha, as the MoviePy composite does
+             f"[fgc]format=rgb24,fade=in:st=0:d={fade_in}[faded];[faded][alpha]alphamerge[fg];"
+             f"[bg][fg]overlay=0:0:format=auto:shortest=1,format=yuv420p[v]")
+    # The background plays from `start` at `speed` (below 1 slows it down), looped if asked
+    background_input = (["-ss", f"{start:.3f}"] if start else []) + (["-stream_loop", "-1"] if loop else [])
+    try:
+        result = subprocess.run(
+            [ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error",
+             *background_input, "-i", background_path,
+             "-loop", "1", "-framerate", str(fps), "-t", f"{duration:.3f}", "-i", overlay_path,
+             "-stream_loop", "-1", "-i", audio_path,
+             "-filter_complex", graph, "-map", "[v]", "-map", "2:a:0",
+             *codec_args, "-c:a", "aac", "-t", f"{duration:.3f}", output_path],
+            capture_output=True, timeout=600
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"ffmpeg overlay failed: {e}")
+        return False
+    if result.returncode != 0:
+        logger.warning(f"ffmpeg overlay failed: {result.stderr.decode(errors='ignore')[-200:]}")
+        return False
+    return True
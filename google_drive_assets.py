@@ -2,23 +2,77 @@
 Google Drive Asset Manager
 Allows using Google Drive folders as cloud storage for assets (backgrounds/audio).
 """
-import io
 import os
+import hashlib
+import shutil
+import json
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import config
 from loguru import logger
+from utils import mark_asset_used
+import httplib2
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.transport.requests import AuthorizedSession, Request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# How long a folder listing is reused before asking Drive again
+LIST_CACHE_TTL_SECONDS = 600
+# Drive's maximum page size, so one request lists most folders whole
+LIST_PAGE_SIZE = 1000
+
+# Response cache for the googleapiclient transport
+HTTP_CACHE_DIR = config.CACHE_DIR / "http"
+
+# Listings and media downloads go over one pooled session; media is streamed to disk through a 1MB buffer
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+DOWNLOAD_NUM_RETRIES = 10
+
+# Large videos are fetched as parallel byte ranges to get past the single-stream throughput limit
+RANGED_DOWNLOAD_MIN_BYTES = 32 * 1024 * 1024
+RANGED_DOWNLOAD_PARTS = 8
+
+# Longest download_random_file waits for a running prefetch to choose its files
+PREFETCH_PLAN_WAIT_SECONDS = 30
 
 class GoogleDriveAssets:
     def __init__(self):
         self.creds = None
         self.service = None
+        self.session = None
         self.scopes = ['https://www.googleapis.com/auth/drive.readonly']
         
+        # Folder listings keyed by folder/extensions, persisted so short-lived runs share them
+        self._list_cache_path = config.CACHE_DIR / "drive_list.json"
+        self._list_cache = self._load_list_cache()
+        self._list_cache_lock = threading.Lock()
+        
+        # googleapiclient/httplib2 objects are not thread-safe, so each thread gets its own service
+        self._local = threading.local()
+        
+        # Local directories already created, so repeated downloads skip the makedirs syscalls
+        self._known_dirs = set()
+        
+        # Serializes eviction so concurrent downloads don't evict each other's files
+        self._lru_lock = threading.Lock()
+        
+        # One lock per local path, so a file is never checked or replaced while another thread downloads it
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._path_locks_guard = threading.Lock()
+        
+        # Files picked by prefetch, handed out first by download_random_file, keyed by (folder_id, local_dir)
+        self._prefetched: Dict[Tuple[str, str], List[dict]] = {}
+        self._prefetched_lock = threading.Lock()
+        # Set once the running prefetch has chosen its files (None when no prefetch was started)
+        self._prefetch_planned: Optional[threading.Event] = None
+        
     def _authenticate(self):
         """Authenticate with Google Drive"""
         if self.service:
@@ -35,7 +89,9 @@ class GoogleDriveAssets:
                     client_secret=config.YOUTUBE_CLIENT_SECRET,
                     scopes=self.scopes
                 )
-                self.service = build('drive', 'v3', credentials=self.creds)
+                self.service = self._build_service()
+                self._local.service = self.service
+                self.session = self._create_session()
                 return
              except Exception as e:
                  logger.warning(f"Failed to auth with env vars: {e}")
@@ -43,9 +99,13 @@ class GoogleDriveAssets:
         # Fallback: Local client_secret.json (For local testing)
         if os.path.exists('client_secret.json'):
              try:
+                 # Only needed for interactive local logins, so keep it off the import path
+                 from google_auth_oauthlib.flow import InstalledAppFlow
                  flow = InstalledAppFlow.from_client_secrets_file('client_secret.json', self.scopes)
                  self.creds = flow.run_local_server(port=0)
-                 self.service = build('drive', 'v3', credentials=self.creds)
+                 self.service = self._build_service()
+                 self._local.service = self.service
+                 self.session = self._create_session()
                  return
              except Exception as e:
                  logger.warning(f"Failed to auth with client_secret.json: {e}")
@@ -58,51 +118,431 @@ class GoogleDriveAssets:
                 logger.error("Google Drive service not initialized")
                 return None
 
-            # List files in folder
-            query = f"'{folder_id}' in parents and trashed = false"
-            results = self.service.files().list(
-                q=query, pageSize=100, fields="files(id, name, mimeType, size)"
-            ).execute()
-            items = results.get('files', [])
+            # Let a running prefetch choose its files first, so this call can use one of them
+            if self._prefetch_planned is not None:
+                self._prefetch_planned.wait(timeout=PREFETCH_PLAN_WAIT_SECONDS)
 
-            if not items:
-                logger.warning(f"No files found in Drive folder: {folder_id}")
-                return None
+            # Take a file the prefetch already fetched (or is fetching), else pick a random one
+            file_to_download = self._take_prefetched(folder_id, local_dir)
+            if file_to_download is None:
+                # List files in folder (cached)
+                items = self._list_files(folder_id, extensions)
+                    
+                if not items:
+                    logger.warning("No matching files found in Drive folder")
+                    return None
 
-            # Filter by extension if needed
-            if extensions:
-                items = [f for f in items if any(f['name'].lower().endswith(ext) for ext in extensions)]
-                
-            if not items:
-                logger.warning(f"No matching files found in Drive folder")
-                return None
-
-            # Pick random file
-            file_to_download = random.choice(items)
-            file_id = file_to_download['id']
-            file_name = file_to_download['name']
+                file_to_download = random.choice(items)
+            return self._download_item(file_to_download, local_dir)
             
-            # Ensure local dir exists
+        except Exception as e:
+            logger.error("Error downloading from Drive: {}", e)
+            return None
+
+    def _download_item(self, file_to_download: dict, local_dir: str) -> str:
+        """Download one listed Drive file to a local directory, reusing a complete local copy"""
+        file_id = file_to_download['id']
+        file_name = file_to_download['name']
+        
+        # Ensure local dir exists (checked once per directory)
+        if local_dir not in self._known_dirs:
             os.makedirs(local_dir, exist_ok=True)
-            local_path = os.path.join(local_dir, "drive_" + file_name)
-            
-            # Check if file already exists locally
-            if os.path.exists(local_path):
-                logger.info(f"File already exists locally: {local_path}")
-                return local_path
+            self._known_dirs.add(local_dir)
+        local_path = os.path.join(local_dir, "drive_" + file_name)
+        
+        # Wait for any in-flight download of the same file instead of reading it half-written
+        with self._path_lock(local_path):
+            # Reuse the local copy only if it is complete and matches the Drive file's content
+            remote_md5 = file_to_download.get('md5Checksum')
+            remote_size = int(file_to_download.get('size') or 0)
+            try:
+                local_size = os.stat(local_path).st_size
+            except FileNotFoundError:
+                local_size = None
+            if local_size is not None:
+                # A size mismatch (e.g. a download cut short by a crash) is caught without hashing
+                complete = local_size > 0 and (not remote_size or local_size == remote_size)
+                if complete and (not remote_md5 or self._local_md5(local_path) == remote_md5):
+                    logger.info("File already exists locally: {}", local_path)
+                    mark_asset_used(local_path)
+                    return local_path
+                logger.info("Local copy is incomplete or outdated, re-downloading: {}", file_name)
+                self._remove_local(local_path)
 
-            logger.info(f"Downloading from Drive: {file_name}")
-            
-            request = self.service.files().get_media(fileId=file_id)
-            fh = io.FileIO(local_path, 'wb')
-            downloader = MediaIoBaseDownload(fh, request)
+            logger.info("Downloading from Drive: {}", file_name)
             
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
+            self._download_file(file_id, local_path, remote_size)
             
-            return local_path
+            if remote_md5:
+                self._write_md5(local_path, remote_md5)
+            mark_asset_used(local_path)
+        self._evict_lru(keep_path=local_path)
+        return local_path
+
+    def _path_lock(self, local_path: str) -> threading.Lock:
+        """Lock guarding one local asset path"""
+        with self._path_locks_guard:
+            return self._path_locks.setdefault(local_path, threading.Lock())
+
+    def _take_prefetched(self, folder_id: str, local_dir: str) -> Optional[dict]:
+        """Next file the prefetch chose for this folder, or None once they are used up"""
+        with self._prefetched_lock:
+            picks = self._prefetched.get((folder_id, local_dir))
+            return picks.pop(0) if picks else None
+
+    def download_many(self, specs: List[Tuple[str, str, list]], max_workers: int = 8) -> List[Optional[str]]:
+        """Download one random file for each (folder_id, local_dir, extensions) spec in parallel"""
+        if not specs:
+            return []
+        
+        # Authenticate once up front so worker threads don't race to do it
+        self._authenticate()
+        if not self.service:
+            logger.error("Google Drive service not initialized")
+            return [None] * len(specs)
+        
+        # Keep concurrency modest to stay under Drive's per-user rate limits
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(specs))) as executor:
+            return list(executor.map(lambda spec: self.download_random_file(*spec), specs))
+
+    def prefetch(self, per_folder: int = None) -> List[Optional[str]]:
+        """Warm the listing cache and pre-download a few distinct assets from each configured folder"""
+        per_folder = per_folder or config.DRIVE_PREFETCH_PER_FOLDER
+        try:
+            self._authenticate()
+            if not self.service or not config.DRIVE_FOLDERS:
+                return []
+            # Warm every folder listing in one batch so the download threads don't each list them
+            try:
+                listings = self.list_folders([(folder_id, extensions) for folder_id, _, extensions in config.DRIVE_FOLDERS])
+            except Exception as e:
+                logger.warning("Batched Drive listing failed: {}", e)
+                listings = {}
             
+            # Pick distinct files, and hand the same ones to download_random_file so they actually get used
+            jobs = []
+            for folder_id, local_dir, extensions in config.DRIVE_FOLDERS:
+                items = listings.get(folder_id) or self._list_files(folder_id, extensions)
+                picks = random.sample(items, min(per_folder, len(items)))
+                with self._prefetched_lock:
+                    self._prefetched[(folder_id, local_dir)] = list(picks)
+                jobs.extend((item, local_dir) for item in picks)
         except Exception as e:
-            logger.error(f"Error downloading from Drive: {e}")
+            logger.warning("Drive prefetch failed: {}", e)
+            return []
+        finally:
+            if self._prefetch_planned is not None:
+                self._prefetch_planned.set()
+        
+        if not jobs:
+            return []
+        logger.info("Prefetching {} Drive assets in the background", len(jobs))
+        
+        def fetch(job):
+            try:
+                return self._download_item(*job)
+            except Exception as e:
+                logger.warning("Prefetch of {} failed: {}", job[0]['name'], e)
+                return None
+        
+        # Keep concurrency modest to stay under Drive's per-user rate limits
+        with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+            return list(executor.map(fetch, jobs))
+
+    def start_prefetch(self) -> Optional[threading.Thread]:
+        """Run prefetch in a daemon thread so downloads overlap with startup (for long-running processes)"""
+        if not config.DRIVE_FOLDERS:
             return None
+        self._prefetch_planned = threading.Event()
+        thread = threading.Thread(target=self.prefetch, name="drive-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def _build_service(self):
+        """Build a Drive v3 service from the discovery document bundled with the client library (no network fetch)"""
+        # Keep-alive httplib2 transport with an on-disk HTTP cache and a bounded timeout
+        http = AuthorizedHttp(self.creds, http=httplib2.Http(cache=str(HTTP_CACHE_DIR), timeout=30))
+        return build('drive', 'v3', http=http, cache_discovery=False, static_discovery=True)
+
+    def _get_service(self):
+        """Get the Drive service for the current thread"""
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._build_service()
+            self._local.service = service
+        return service
+
+    def _create_session(self) -> AuthorizedSession:
+        """Create the pooled, authorized HTTP session shared by listings and downloads"""
+        session = AuthorizedSession(self.creds)
+        # Retry throttling/transient server errors with exponential backoff
+        retry = Retry(total=DOWNLOAD_NUM_RETRIES, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504))
+        # Keep-alive pool sized for download_many so threads reuse TLS connections
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retry)
+        session.mount("https://", adapter)
+        return session
+
+    def _download_file(self, file_id: str, local_path: str, size: int = 0):
+        """Stream a Drive file's content directly to disk"""
+        url = f"{DRIVE_FILES_URL}/{file_id}"
+        # os.pwrite is POSIX-only; elsewhere large files use the single stream below
+        if size > RANGED_DOWNLOAD_MIN_BYTES and hasattr(os, "pwrite"):
+            self._download_ranged(url, local_path, size)
+            return
+
+        # Media is already compressed, so ask for the raw bytes and skip gzip work
+        headers = {"Accept-Encoding": "identity"}
+        with self.session.get(url, params={"alt": "media"}, headers=headers, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            self._preallocate(fd, size)
+            with open(fd, "wb", buffering=DOWNLOAD_BUFFER_SIZE) as fh:
+                shutil.copyfileobj(response.raw, fh, length=DOWNLOAD_BUFFER_SIZE)
+                # Drop any preallocated tail so a cut-short download still fails the size check
+                fh.truncate()
+
+    def _download_ranged(self, url: str, local_path: str, size: int):
+        """Download a large file as parallel byte ranges written in place"""
+        part_size = -(-size // RANGED_DOWNLOAD_PARTS)
+        ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+
+        fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            self._preallocate(fd, size)
+            os.ftruncate(fd, size)
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                list(executor.map(lambda bounds: self._fetch_range(url, fd, *bounds), ranges))
+        except Exception:
+            # The file already has its final size, so never leave a half-written one behind
+            os.close(fd)
+            self._remove_local(local_path)
+            raise
+        os.close(fd)
+
+    def _preallocate(self, fd: int, size: int):
+        """Reserve a file's full size up front so it is laid out in as few extents as possible"""
+        # posix_fallocate is missing on Windows/macOS; those just grow the file as it is written
+        if size > 0 and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError as e:
+                logger.debug("Could not preallocate {} bytes: {}", size, e)
+
+    def _fetch_range(self, url: str, fd: int, start: int, end: int):
+        """Fetch bytes start..end (inclusive) of a Drive file into fd at the same offset"""
+        headers = {"Accept-Encoding": "identity", "Range": f"bytes={start}-{end}"}
+        offset = start
+        with self.session.get(url, params={"alt": "media"}, headers=headers, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise IOError("Drive ignored the Range header")
+            for chunk in response.iter_content(DOWNLOAD_BUFFER_SIZE):
+                view = memoryview(chunk)
+                while view:
+                    written = os.pwrite(fd, view, offset)
+                    view = view[written:]
+                    offset += written
+        if offset != end + 1:
+            raise IOError(f"Short read for bytes {start}-{end}")
+
+    def _local_md5(self, local_path: str) -> str:
+        """MD5 of a downloaded asset, read from its .md5 sidecar (computed once if missing)"""
+        sidecar = local_path + ".md5"
+        try:
+            with open(sidecar, "r") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            pass
+        
+        digest = hashlib.md5()
+        with open(local_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        md5 = digest.hexdigest()
+        self._write_md5(local_path, md5)
+        return md5
+
+    def _remove_local(self, local_path: str):
+        """Delete a stale local asset and its checksum sidecar"""
+        for path in (local_path, local_path + ".md5"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _evict_lru(self, keep_path: str = None):
+        """Delete least-recently-used assets until the total fits config.DRIVE_CACHE_MAX_BYTES"""
+        max_bytes = config.DRIVE_CACHE_MAX_BYTES
+        if max_bytes <= 0:
+            return
+        with self._lru_lock:
+            # The cache is whatever drive_* files are on this machine; mark_asset_used keeps their mtimes current
+            entries = []
+            for local_dir in {spec[1] for spec in config.DRIVE_FOLDERS}:
+                try:
+                    with os.scandir(local_dir) as it:
+                        for entry in it:
+                            if entry.name.startswith("drive_") and not entry.name.endswith(".md5") and entry.is_file():
+                                stat = entry.stat()
+                                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                except FileNotFoundError:
+                    continue
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= max_bytes:
+                    break
+                if path == keep_path:
+                    continue
+                # Leave files another thread is downloading or checking right now
+                lock = self._path_lock(path)
+                if not lock.acquire(blocking=False):
+                    continue
+                try:
+                    logger.info("Evicting cached Drive asset: {}", path)
+                    self._remove_local(path)
+                    total -= size
+                finally:
+                    lock.release()
+
+    def _write_md5(self, local_path: str, md5: str):
+        """Record the content checksum next to a downloaded asset"""
+        try:
+            with open(local_path + ".md5", "w") as f:
+                f.write(md5)
+        except OSError as e:
+            logger.debug("Could not write checksum for {}: {}", local_path, e)
+
+    def list_folders(self, folders: List[Tuple[str, Optional[list]]]) -> Dict[str, list]:
+        """List several Drive folders in one batched request, keyed by folder id"""
+        self._authenticate()
+        if not self.service:
+            logger.error("Google Drive service not initialized")
+            return {}
+
+        results = {}
+        pending = []
+        for folder_id, extensions in folders:
+            cached = self._cached_listing(folder_id, extensions)
+            if cached is not None:
+                results[folder_id] = cached
+            else:
+                pending.append((folder_id, extensions))
+
+        if pending:
+            service = self._get_service()
+            batch = service.new_batch_http_request()
+            unfinished = []
+            for folder_id, extensions in pending:
+                def on_response(request_id, response, exception, folder_id=folder_id, extensions=extensions):
+                    if exception is not None:
+                        logger.warning("Failed to list Drive folder {}: {}", folder_id, exception)
+                        return
+                    if response.get('nextPageToken'):
+                        # Larger folders are paged through whole by _list_files below
+                        unfinished.append((folder_id, extensions))
+                        return
+                    items = self._filter_names(response.get('files', []), extensions)
+                    if items:
+                        self._store_listing(folder_id, extensions, items)
+                    results[folder_id] = items
+                batch.add(
+                    service.files().list(
+                        q=self._list_query(folder_id, extensions),
+                        pageSize=LIST_PAGE_SIZE,
+                        orderBy="createdTime desc",
+                        fields="nextPageToken, files(id, name, md5Checksum, size)",
+                    ),
+                    callback=on_response,
+                )
+            # Media can't be batched, but the listing step for every folder goes in one round trip
+            batch.execute()
+            for folder_id, extensions in unfinished:
+                results[folder_id] = self._list_files(folder_id, extensions)
+        return results
+
+    def _list_files(self, folder_id: str, extensions: list = None) -> list:
+        """List files in a Drive folder, reusing a recent listing when available"""
+        cached = self._cached_listing(folder_id, extensions)
+        if cached is not None:
+            return cached
+
+        params = {
+            "q": self._list_query(folder_id, extensions),
+            "pageSize": LIST_PAGE_SIZE,
+            "orderBy": "createdTime desc",
+            "fields": "nextPageToken, files(id, name, md5Checksum, size)",
+        }
+        
+        # One large page covers most folders; larger ones are paged through whole so every file can be picked
+        # (the listing is cached for LIST_CACHE_TTL_SECONDS, so the extra pages are rare)
+        items = []
+        while True:
+            response = self.session.get(DRIVE_FILES_URL, params=params, timeout=30)
+            response.raise_for_status()
+            page = response.json()
+            items.extend(self._filter_names(page.get('files', []), extensions))
+            
+            next_token = page.get('nextPageToken')
+            if not next_token:
+                break
+            params["pageToken"] = next_token
+
+        if not items:
+            logger.warning("No files found in Drive folder: {}", folder_id)
+            return []
+
+        self._store_listing(folder_id, extensions, items)
+        return items
+
+    def _list_query(self, folder_id: str, extensions: list = None) -> str:
+        """Drive search query for a folder's files"""
+        # Let Drive filter by extension so only candidate rows come back
+        query = f"'{folder_id}' in parents and trashed = false"
+        if extensions:
+            ext_clause = " or ".join(f"name contains '{ext}'" for ext in extensions)
+            query += f" and ({ext_clause})"
+        return query
+
+    def _filter_names(self, files: list, extensions: list = None) -> list:
+        """Keep files whose names end with one of the extensions"""
+        # "contains" is not a suffix match, so keep a cheap check on the returned rows
+        if not extensions:
+            return files
+        return [f for f in files if f['name'].lower().endswith(tuple(extensions))]
+
+    def _cached_listing(self, folder_id: str, extensions: list = None) -> Optional[list]:
+        """Recent listing for a folder, or None if it has to be fetched"""
+        cached = self._list_cache.get(f"{folder_id}|{','.join(extensions or ())}")
+        if cached and time.time() - cached[0] < LIST_CACHE_TTL_SECONDS:
+            return cached[1]
+        return None
+
+    def _store_listing(self, folder_id: str, extensions: list, items: list):
+        """Cache a folder listing in memory and on disk"""
+        with self._list_cache_lock:
+            self._list_cache[f"{folder_id}|{','.join(extensions or ())}"] = (time.time(), items)
+            self._save_list_cache()
+
+    def _load_list_cache(self) -> dict:
+        """Load persisted folder listings"""
+        try:
+            with open(self._list_cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.debug(f"Could not read Drive listing cache: {e}")
+            return {}
+
+    def _save_list_cache(self):
+        """Persist folder listings for later runs"""
+        try:
+            self._list_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._list_cache_path, "w", encoding="utf-8") as f:
+                json.dump(self._list_cache, f)
+        except Exception as e:
+            logger.debug(f"Could not write Drive listing cache: {e}")
+
+# Shared instance so credentials, services and listing caches are reused across the pipeline
+drive_assets = GoogleDriveAssets()
@@ -3,34 +3,39 @@ Main entry point for the Social Media Agent
 Can run as scheduler (24/7) or one-time execution
 """
 import sys
-import argparse
+from types import SimpleNamespace
 from loguru import logger
-import config
+import app_bootstrap
 from pipeline import Pipeline
 from scheduler import Scheduler
-from database import init_db
 
-def setup_logging():
-    """Configure logging"""
-    logger.remove()  # Remove default handler
-    logger.add(
-        sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
-        level="INFO"
-    )
-    logger.add(
-        config.LOGS_DIR / "agent_{time}.log",
-        rotation="1 day",
-        retention="30 days",
-        level="DEBUG"
-    )
+_MODES = ("run", "schedule")
 
-def main():
-    """Main entry point"""
+def parse_args(argv=None):
+    """Parse command-line options, only building an argparse parser when needed"""
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # Fast path for the common "--mode X --slot Y" invocations
+    options = {"mode": "schedule", "slot": "manual"}
+    if len(argv) % 2 == 0:
+        for flag, value in zip(argv[::2], argv[1::2]):
+            if flag not in ("--mode", "--slot") or value.startswith("-"):
+                break
+            options[flag[2:]] = value
+        else:
+            if options["mode"] in _MODES:
+                return SimpleNamespace(**options)
+    
+    # --help, --opt=value forms and errors get argparse's full handling
+    return _build_parser().parse_args(argv)
+
+def _build_parser():
+    """Build the full argument parser"""
+    import argparse
     parser = argparse.ArgumentParser(description="Social Media Posting Agent")
     parser.add_argument(
         "--mode",
-        choices=["run", "schedule"],
+        choices=_MODES,
         default="schedule",
         help="Run mode: 'run' for one-time execution, 'schedule' for 24/7 scheduler"
     )
@@ -40,33 +45,19 @@ def main():
         default="manual",
         help="Slot name for one-time run (used in run mode)"
     )
+    return parser
+
+def main():
+    """Main entry point"""
+    args = parse_args()
     
-    args = parser.parse_args()
-    
-    # Setup logging
-    setup_logging()
-    
-    # Initialize database
-    logger.info("Initializing database...")
-    init_db()
-    logger.info("Database initialized")
+    # Only the 24/7 scheduler reuses prefetched Drive assets across runs
+    app_bootstrap.bootstrap("agent", prefetch=args.mode == "schedule")
     
     if args.mode == "run":
         # One-time execution
         logger.info(f"Running one-time pipeline execution (slot: {args.slot})")
-        pipeline = Pipeline()
-        result = pipeline.run(slot_name=args.slot)
-        
-        if result["status"] == "success":
-            logger.info("Pipeline execution completed successfully")
-            logger.info(f"Post ID: {result.get('post_id')}")
-            logger.info(f"Publish results: {result.get('publish_results', {})}")
-            if result.get("warnings"):
-                logger.warning(f"Warnings: {result.get('warnings', [])}")
-        else:
-            logger.error("Pipeline execution failed")
-            logger.error(f"Errors: {result.get('errors', [])}")
-            sys.exit(1)
+        app_bootstrap.run_pipeline(Pipeline, "Pipeline execution", slot_name=args.slot)
     
     elif args.mode == "schedule":
         # 24/7 scheduler mode
@@ -3,12 +3,23 @@ Media generation service
 Creates 9:16 vertical videos with text overlays, background, and TTS audio
 """
 import os
+import functools
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import shutil
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from loguru import logger
 import config
+from utils import mark_asset_used
+from ffmpeg_utils import (
+    enable_hwaccel_decode, has_cuda_decode, has_nvenc, scale_video_cuda, stream_loop
+)
 from moviepy.editor import (
-    VideoFileClip, ImageClip, CompositeVideoClip,
+    VideoClip, VideoFileClip, ImageClip, CompositeVideoClip,
     AudioFileClip, concatenate_videoclips, ColorClip
 )
 from PIL import Image, ImageDraw, ImageFont
@@ -16,6 +27,158 @@ import numpy as np
 from gtts import gTTS
 import io
 import tempfile
+import uuid
+
+@functools.lru_cache(maxsize=8)
+def _load_truetype(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Parse a TrueType font once per (path, size)"""
+    return ImageFont.truetype(path, size)
+
+def _wrap_words(draw: ImageDraw.ImageDraw, text: str, font, max_width: int) -> List[str]:
+    """Greedy word wrap to lines at most max_width wide, measuring each word once"""
+    words = text.split()
+    widths = [font.getlength(word) for word in words]
+    space = font.getlength(' ')
+    # Summed advance widths differ from the rendered bbox by side bearings and kerning,
+    # so lines this close to the limit are measured exactly with textbbox
+    slack = 0.25 * getattr(font, 'size', 10) + 0.02 * max_width
+    
+    lines = []
+    current_line = []
+    line_width = 0.0
+    for word, word_width in zip(words, widths):
+        candidate_width = line_width + space + word_width if current_line else word_width
+        if candidate_width < max_width - slack:
+            fits = True
+        elif candidate_width > max_width + slack:
+            fits = False
+        else:
+            bbox = draw.textbbox((0, 0), ' '.join(current_line + [word]), font=font)
+            fits = bbox[2] - bbox[0] <= max_width
+        
+        if fits:
+            current_line.append(word)
+            line_width = candidate_width
+        else:
+            if current_line:
+                lines.append(' '.join(current_line))
+            current_line = [word]
+            line_width = word_width
+    
+    if current_line:
+        lines.append(' '.join(current_line))
+    return lines
+
+# Each entry is two full-frame 8-bit masks (~4MB at 1080x1920)
+@functools.lru_cache(maxsize=32)
+def _rasterize_text(text: str, font: ImageFont.FreeTypeFont, is_hook: bool, width: int, height: int) -> Tuple[Tuple[int, int, int], np.ndarray, np.ndarray]:
+    """Render wrapped, outlined overlay text as (text RGB, fill coverage, alpha) with read-only uint8 masks
+    
+    The outline is black and the fill a single color, so two masks describe the overlay fully
+    (fonts come from _load_truetype, so they key the cache stably)
+    """
+    # STEP 2: Create the fill coverage mask
+    mask = Image.new('L', (width, height), 0)
+    draw = ImageDraw.Draw(mask)
+    
+    # STEP 3: Word wrap text
+    lines = _wrap_words(draw, text, font, width - 200)
+    
+    # STEP 4: Set colors
+    if is_hook:
+        text_color = (255, 255, 0, 255)
+        outline_color = (0, 0, 0, 255)
+        outline_width = 4
+    else:
+        text_color = (255, 255, 255, 255)
+        outline_color = (0, 0, 0, 255)
+        outline_width = 3
+    
+    # STEP 5: Calculate positions - ALL HARDCODED, NO MULTIPLICATION
+    if is_hook:
+        line_height_num = 225  # Hardcoded
+    else:
+        line_height_num = 165  # Hardcoded
+    
+    num_lines = len(lines)
+    total_height_num = num_lines * line_height_num  # Both are integers
+    start_y_num = (height - total_height_num) // 2 - 100
+    
+    # STEP 6: Draw text
+    positions = []
+    for line_idx in range(num_lines):
+        line = lines[line_idx]
+        bbox = draw.textbbox((0, 0), line, font=font)
+        text_width = bbox[2] - bbox[0]
+        x = (width - text_width) // 2
+        y = start_y_num + (line_idx * line_height_num)  # All integers
+        positions.append((x, y, line))
+    
+    for x, y, line in positions:
+        draw.text((x, y), line, font=font, fill=255)
+    
+    # Draw outline and text together: FreeType strokes each line natively
+    alpha = Image.new('L', (width, height), 0)
+    alpha_draw = ImageDraw.Draw(alpha)
+    for x, y, line in positions:
+        alpha_draw.text((x, y), line, font=font, fill=text_color[3],
+                        stroke_width=outline_width, stroke_fill=outline_color[3])
+    
+    fill = np.asarray(mask)
+    alpha = np.asarray(alpha)
+    fill.flags.writeable = False
+    alpha.flags.writeable = False
+    return text_color[:3], fill, alpha
+
+def _text_pixels(text_rgb: Tuple[int, int, int], fill: np.ndarray) -> np.ndarray:
+    """RGB frame for a text overlay: the text color scaled by fill coverage over the black outline"""
+    if text_rgb == (255, 255, 255):
+        return np.repeat(fill[:, :, None], 3, axis=2)
+    scale = np.asarray(text_rgb, dtype=np.float32) / 255.0
+    return np.rint(fill[:, :, None] * scale).astype(np.uint8)
+
+# A sentence body followed by its end punctuation (trailing text without punctuation is not a sentence)
+_SENTENCE_RE = re.compile(r'([^.!?]*)([.!?]+)')
+
+@functools.lru_cache(maxsize=4)
+def _segment_script(script: str) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, int, int], ...]]:
+    """Split a script in one pass into its words and (sentence, word_start, word_count) tuples"""
+    sentences = []
+    word_start = 0
+    for match in _SENTENCE_RE.finditer(script):
+        sentence = match.group(0).strip()
+        word_count = len(sentence.split())
+        if word_count:
+            sentences.append((sentence, word_start, word_count))
+            word_start += word_count
+    return tuple(script.split()), tuple(sentences)
+
+# Use a modern color scheme
+GRADIENT_COLORS = (
+    (25, 25, 112),    # Midnight blue
+    (72, 61, 139),    # Dark slate blue  
+    (123, 104, 238),  # Medium slate blue
+)
+
+# Create a more interesting gradient background
+@functools.lru_cache(maxsize=4)
+def _gradient_image(width: int, height: int, colors: tuple = GRADIENT_COLORS) -> np.ndarray:
+    """Vertical gradient through `colors` as a read-only (height, width, 3) uint8 array"""
+    # Interpolate one column of row colors, then broadcast across the width
+    stops = np.asarray(colors, dtype=np.float64)
+    positions = np.arange(height) / height * (len(colors) - 1)
+    color_idx = positions.astype(np.intp)
+    next_idx = np.minimum(color_idx + 1, len(colors) - 1)
+    blend = (positions - color_idx)[:, None]
+    rows = (stops[color_idx] * (1 - blend) + stops[next_idx] * blend).astype(np.uint8)
+    gradient = np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (height, width, 3)))
+    gradient.flags.writeable = False
+    return gradient
+
+ENCODE_THREADS = max(2, os.cpu_count() or 4)
+
+# Synthesized speech keyed by provider/language/script
+TTS_CACHE_DIR = config.CACHE_DIR / "tts"
 
 class MediaGenerator:
     """Generate 9:16 vertical videos for social media"""
@@ -25,26 +188,44 @@ class MediaGenerator:
         self.height = config.VIDEO_HEIGHT
         self.fps = config.VIDEO_FPS
         
+        # (font_hook, font_main) resolved on first use
+        self._font_cache = None
+        
+        # Intermediate files (e.g. looped backgrounds) live in one private directory, removed
+        # file-by-file after each video and as a whole when the generator is garbage-collected
+        self._tmpdir = tempfile.TemporaryDirectory(prefix='mediagen_')
+        self._temp_paths = []
+        
         # Ensure output directory exists
         config.MEDIA_DIR.mkdir(parents=True, exist_ok=True)
+        
+        # GPU decode for background videos (patches MoviePy's reader once per process)
+        if config.USE_HWACCEL and has_cuda_decode():
+            enable_hwaccel_decode()
     
     def generate_video(self, content: Dict, news_title: str) -> Optional[str]:
         """Generate complete video from content"""
         logger.info("Starting video generation...")
         
         try:
-            # Step 1: Generate TTS audio
-            audio_path = self._generate_tts(content["script"], news_title)
-            if not audio_path:
-                logger.error("Failed to generate TTS audio")
-                return None
-            
-            # Step 2: Get audio duration
-            audio_clip = AudioFileClip(audio_path)
-            duration = audio_clip.duration
-            
-            # Step 3: Create background
-            background = self._create_background(duration)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # Step 1: Generate TTS audio (network-bound), resolving fonts meanwhile
+                fonts_future = executor.submit(self._get_fonts)
+                audio_path = self._generate_tts(content["script"], news_title)
+                fonts_future.result()
+                if not audio_path:
+                    logger.error("Failed to generate TTS audio")
+                    return None
+                
+                # Step 2: Get audio duration
+                audio_clip = AudioFileClip(audio_path)
+                duration = audio_clip.duration
+                
+                # Step 3: Create background while the overlay text is rasterized in the other thread
+                # (only numpy arrays cross threads; MoviePy clips stay on this one)
+                text_future = executor.submit(self._prerender_text, content, duration)
+                background = self._create_background(duration)
+                text_future.result()
             
             # Step 4: Add text overlays
             video_with_text = self._add_text_overlays(background, content, duration)
@@ -54,14 +235,7 @@ class MediaGenerator:
             
             # Step 6: Export video
             output_path = config.MEDIA_DIR / f"video_{int(os.path.getmtime(audio_path))}.mp4"
-            final_video.write_videofile(
-                str(output_path),
-                fps=self.fps,
-                codec='libx264',
-                audio_codec='aac',
-                preset='medium',
-                bitrate='5000k'
-            )
+            self._write_video(final_video, str(output_path))
             
             # Cleanup
             audio_clip.close()
@@ -76,26 +250,92 @@ class MediaGenerator:
             import traceback
             logger.error(traceback.format_exc())
             return None
+        finally:
+            self._cleanup_temp_files()
+    
+    def _temp_path(self, suffix: str) -> str:
+        """New path in the generator's temp directory, deleted by _cleanup_temp_files"""
+        path = os.path.join(self._tmpdir.name, f"tmp_{uuid.uuid4().hex}{suffix}")
+        self._temp_paths.append(path)
+        return path
+    
+    def _cleanup_temp_files(self):
+        """Delete intermediate files created while building a video"""
+        while self._temp_paths:
+            path = self._temp_paths.pop()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    
+    def _encoder_settings(self, use_nvenc: bool) -> Dict:
+        """write_videofile codec settings, using the NVENC hardware encoder when asked"""
+        if use_nvenc:
+            # moviepy only adds -pix_fmt yuv420p for libx264, so set it for NVENC too
+            return {
+                'codec': 'h264_nvenc',
+                'preset': 'p4',
+                'ffmpeg_params': ['-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-pix_fmt', 'yuv420p'],
+            }
+        # One encoder thread per core
+        return {'codec': 'libx264', 'preset': config.X264_PRESET, 'threads': ENCODE_THREADS}
+    
+    def _write_video(self, clip, output_path: str):
+        """Encode the final video, on the GPU when available (libx264 otherwise)"""
+        use_nvenc = has_nvenc()
+        try:
+            clip.write_videofile(
+                output_path,
+                fps=self.fps,
+                audio_codec='aac',
+                bitrate='5000k',
+                **self._encoder_settings(use_nvenc)
+            )
+        except Exception as e:
+            if not use_nvenc:
+                raise
+            logger.warning(f"NVENC encode failed ({e}), retrying with libx264")
+            clip.write_videofile(
+                output_path,
+                fps=self.fps,
+                audio_codec='aac',
+                bitrate='5000k',
+                **self._encoder_settings(False)
+            )
     
     def _generate_tts(self, script: str, identifier: str) -> Optional[str]:
-        """Generate text-to-speech audio"""
+        """Generate text-to-speech audio (cached per provider/script)"""
         logger.info("Generating TTS audio...")
         
         try:
+            suffix = ".mp3" if config.TTS_PROVIDER == "gtts" else ".wav"
+            audio_path = config.MEDIA_DIR / f"audio_{identifier.replace(' ', '_')[:50]}{suffix}"
+            
+            # Same script + provider always synthesizes the same audio, so reuse it across retries
+            key = hashlib.sha256(f"{config.TTS_PROVIDER}|en|{script}".encode("utf-8")).hexdigest()
+            cached_path = TTS_CACHE_DIR / f"{key}{suffix}"
+            if cached_path.exists():
+                shutil.copyfile(cached_path, audio_path)
+                logger.info(f"TTS audio reused from cache: {audio_path}")
+                return str(audio_path)
+            
+            TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Synthesize to a temp name and rename, so a crash never leaves a truncated cache entry
+            temp_path = cached_path.with_name(f"{key}.{os.getpid()}.tmp{suffix}")
             if config.TTS_PROVIDER == "gtts":
                 tts = gTTS(text=script, lang='en', slow=False)
-                audio_path = config.MEDIA_DIR / f"audio_{identifier.replace(' ', '_')[:50]}.mp3"
-                tts.save(str(audio_path))
-                logger.info(f"TTS audio saved: {audio_path}")
-                return str(audio_path)
+                tts.save(str(temp_path))
             else:
                 # Fallback to pyttsx3
                 import pyttsx3
                 engine = pyttsx3.init()
-                audio_path = config.MEDIA_DIR / f"audio_{identifier.replace(' ', '_')[:50]}.wav"
-                engine.save_to_file(script, str(audio_path))
+                engine.save_to_file(script, str(temp_path))
                 engine.runAndWait()
-                return str(audio_path)
+            os.replace(temp_path, cached_path)
+            
+            shutil.copyfile(cached_path, audio_path)
+            logger.info(f"TTS audio saved: {audio_path}")
+            return str(audio_path)
                 
         except Exception as e:
             logger.error(f"Error generating TTS: {e}")
@@ -112,12 +352,21 @@ class MediaGenerator:
             import random
             bg_path = random.choice(bg_videos)
             logger.info(f"Using random background video: {bg_path.name} (selected from {len(bg_videos)} options)")
+            mark_asset_used(bg_path)
             bg_clip = VideoFileClip(str(bg_path))
             original_duration = bg_clip.duration
             logger.info(f"Background video duration: {original_duration:.2f}s, needed: {duration:.2f}s")
             
-            # Resize first
-            bg_clip = bg_clip.resize((self.width, self.height))
+            # Resize first (on the GPU into a temp file when possible, so frames arrive at output size);
+            # a clip already at the output size is used as-is rather than re-encoded
+            if tuple(bg_clip.size) != (self.width, self.height):
+                scaled_path = self._gpu_scaled_background(str(bg_path), duration)
+                if scaled_path:
+                    bg_clip.close()
+                    bg_path = Path(scaled_path)
+                    bg_clip = VideoFileClip(scaled_path)
+                else:
+                    bg_clip = bg_clip.resize((self.width, self.height))
             
             if bg_clip.duration < duration:
                 # Calculate how much we need to slow it down
@@ -129,19 +378,26 @@ class MediaGenerator:
                 if bg_clip.duration < 3.0 and speed_factor < 0.1:
                     # Video is very short, use looping with slight slowdown for better quality
                     logger.info("Video is very short, using looping with slight slowdown")
-                    loops_needed = max(1, int(duration / bg_clip.duration) + 1)
-                    # Slow down each loop slightly (2x slower) for smoother appearance
-                    try:
-                        from moviepy.video.fx.all import speedx
-                        slowed_clip = bg_clip.fx(speedx, 0.5)  # 2x slower
-                        looped_clips = [slowed_clip] * loops_needed
-                        bg_clip = concatenate_videoclips(looped_clips)
-                        logger.info(f"Created {loops_needed} loops with 2x slowdown")
-                    except:
-                        # Fallback: just loop normally
-                        looped_clips = [bg_clip] * loops_needed
-                        bg_clip = concatenate_videoclips(looped_clips)
-                        logger.info(f"Created {loops_needed} loops")
+                    # Loop in a single ffmpeg stream copy; half the length is needed since it's slowed 2x
+                    looped_clip = self._stream_looped_clip(str(bg_path), duration * 0.5 + 1.0)
+                    if looped_clip is not None:
+                        bg_clip.close()
+                        bg_clip = looped_clip
+                        logger.info("Looped background with ffmpeg -stream_loop and 2x slowdown")
+                    else:
+                        loops_needed = max(1, int(duration / bg_clip.duration) + 1)
+                        # Slow down each loop slightly (2x slower) for smoother appearance
+                        try:
+                            from moviepy.video.fx.all import speedx
+                            slowed_clip = bg_clip.fx(speedx, 0.5)  # 2x slower
+                            looped_clips = [slowed_clip] * loops_needed
+                            bg_clip = concatenate_videoclips(looped_clips)
+                            logger.info(f"Created {loops_needed} loops with 2x slowdown")
+                        except:
+                            # Fallback: just loop normally
+                            looped_clips = [bg_clip] * loops_needed
+                            bg_clip = concatenate_videoclips(looped_clips)
+                            logger.info(f"Created {loops_needed} loops")
                 else:
                     # Normal slowdown - use speedx for smooth result
                     try:
@@ -192,43 +448,35 @@ class MediaGenerator:
             logger.info("Creating gradient background")
             return self._create_gradient_background(duration)
     
+    def _gpu_scaled_background(self, bg_path: str, duration: float) -> Optional[str]:
+        """Scale the first `duration` seconds of a background to the output size with CUDA decode/scale/encode (None when no GPU)"""
+        if not (config.USE_HWACCEL and has_cuda_decode() and has_nvenc()):
+            return None
+        scaled_path = self._temp_path(".mp4")
+        if scale_video_cuda(bg_path, self.width, self.height, scaled_path, duration):
+            return scaled_path
+        return None
+    
+    def _stream_looped_clip(self, bg_path: str, loop_duration: float) -> Optional[VideoFileClip]:
+        """Loop a short background with one ffmpeg stream copy, resized and slowed 2x (None if ffmpeg can't)"""
+        looped_path = self._temp_path(".mp4")
+        if not stream_loop(bg_path, loop_duration, looped_path):
+            return None
+        try:
+            from moviepy.video.fx.all import speedx
+            looped_clip = VideoFileClip(looped_path)
+            if tuple(looped_clip.size) != (self.width, self.height):
+                looped_clip = looped_clip.resize((self.width, self.height))
+            return looped_clip.fx(speedx, 0.5)  # 2x slower
+        except Exception as e:
+            logger.warning(f"Could not use stream-looped background: {e}")
+            return None
+    
     def _create_gradient_background(self, duration: float) -> VideoFileClip:
         """Create an animated gradient background"""
         try:
-            # Create a more interesting gradient background
-            # Use a modern color scheme
-            colors = [
-                (25, 25, 112),    # Midnight blue
-                (72, 61, 139),    # Dark slate blue  
-                (123, 104, 238),  # Medium slate blue
-            ]
-            
-            # Create gradient image
-            img = Image.new('RGB', (self.width, self.height), colors[0])
-            draw = ImageDraw.Draw(img)
-            
-            # Create vertical gradient
-            for y in range(self.height):
-                progress = y / self.height
-                color_idx = int(progress * (len(colors) - 1))
-                next_idx = min(color_idx + 1, len(colors) - 1)
-                blend = (progress * (len(colors) - 1)) - color_idx
-                
-                color1 = colors[color_idx]
-                color2 = colors[next_idx]
-                
-                r = int(color1[0] * (1 - blend) + color2[0] * blend)
-                g = int(color1[1] * (1 - blend) + color2[1] * blend)
-                b = int(color1[2] * (1 - blend) + color2[2] * blend)
-                
-                draw.rectangle([(0, y), (self.width, y+1)], fill=(r, g, b))
-            
-            # Save and create clip
-            temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-            img.save(temp_file.name)
-            temp_file.close()
-            
-            clip = ImageClip(temp_file.name, duration=duration)
+            # Same colors and size always give the same image, so it is built once per process
+            clip = ImageClip(_gradient_image(self.width, self.height), duration=duration)
             
             # Add subtle zoom effect for motion
             def zoom(t):
@@ -245,73 +493,11 @@ class MediaGenerator:
     
     def _add_text_overlays(self, background: VideoFileClip, content: Dict, duration: float) -> CompositeVideoClip:
         """Add text overlays with perfect audio sync and animations"""
-        clips = [background]
+        overlays = []  # (start_time, text clip) in drawing order
         
         logger.info(f"Adding text overlays. Duration: {duration:.2f}s")
         
-        # Load better fonts (try bold first, then custom fonts)
-        font_hook = None
-        font_main = None
-        font_hook_size = 150  # Track font sizes explicitly
-        font_main_size = 110
-        
-        try:
-            # Try custom fonts from assets/fonts first
-            custom_fonts = list(config.FONTS_DIR.glob("*.ttf"))
-            if custom_fonts:
-                try:
-                    font_path = str(custom_fonts[0])
-                    logger.info(f"Using custom font: {font_path}")
-                    # Much larger fonts for better readability on mobile screens (9:16 vertical format)
-                    font_hook = ImageFont.truetype(font_path, font_hook_size)  # 150px for hook
-                    font_main = ImageFont.truetype(font_path, font_main_size)  # 110px for main text
-                    logger.info(f"Font sizes: hook={font_hook_size}px, main={font_main_size}px")
-                except Exception as e:
-                    logger.warning(f"Failed to load custom font: {e}")
-            
-            # Fallback to system fonts
-            if not font_hook:
-                font_paths = [
-                    "C:/Windows/Fonts/arialbd.ttf",  # Arial Bold
-                    "C:/Windows/Fonts/calibrib.ttf",  # Calibri Bold
-                    "C:/Windows/Fonts/arial.ttf",     # Arial Regular
-                ]
-                
-                for path in font_paths:
-                    if os.path.exists(path):
-                        try:
-                            # Much larger fonts for better readability on mobile screens
-                            font_hook = ImageFont.truetype(path, font_hook_size)  # 150px for hook
-                            font_main = ImageFont.truetype(path, font_main_size)   # 110px for main text
-                            logger.info(f"Using system font: {path} (size: hook={font_hook_size}px, main={font_main_size}px)")
-                            break
-                        except Exception as e:
-                            logger.warning(f"Failed to load {path}: {e}")
-                            continue
-            
-            if not font_hook:
-                # Default font is very small, try to scale it up
-                try:
-                    # Try to get a larger default font
-                    default_font = ImageFont.load_default()
-                    # For default font, we'll need to use a workaround since it doesn't support size
-                    font_hook = default_font
-                    font_main = default_font
-                    font_hook_size = 20  # Default font is very small
-                    font_main_size = 16
-                    logger.warning("Using default font (very small - consider adding custom fonts)")
-                except:
-                    font_hook = ImageFont.load_default()
-                    font_main = ImageFont.load_default()
-                    font_hook_size = 20
-                    font_main_size = 16
-                    logger.warning("Using default font (very small - consider adding custom fonts)")
-        except Exception as e:
-            logger.error(f"Error loading fonts: {e}")
-            font_hook = ImageFont.load_default()
-            font_main = ImageFont.load_default()
-            font_hook_size = 20
-            font_main_size = 16
+        font_hook, font_main = self._get_fonts()
         
         # Add hook text with animation (first 3-4 seconds)
         hook = content.get("hook", "")
@@ -325,7 +511,7 @@ class MediaGenerator:
 # font_size removed - using is_hook flag instead
             )
             if hook_clip:
-                clips.append(hook_clip.set_start(0))
+                overlays.append((0, hook_clip))
                 logger.info(f"Hook text clip created: duration={hook_clip.duration:.2f}s")
             else:
                 logger.error("Failed to create hook text clip")
@@ -344,10 +530,15 @@ class MediaGenerator:
         logger.info(f"Processing {len(on_screen_texts)} text segments")
         
         # Improve timing based on actual script words
-        script_words = script.split()
+        script_words = _segment_script(script)[0]
         current_word_index = 0
         text_clips_created = 0
         
+        # Index every word's positions once so each segment only checks its real candidate starts
+        word_positions = defaultdict(list)
+        for i, word in enumerate(script_words):
+            word_positions[word].append(i)
+        
         for idx, text_seg in enumerate(on_screen_texts):
             text = text_seg.get("text", "").strip()
             start_time = text_seg.get("start_time", 0)
@@ -361,10 +552,19 @@ class MediaGenerator:
             if script and text:
                 # Find text in script
                 text_words = text.split()
-                if len(text_words) > 0:
+                if text_seg.get("word_start") == current_word_index and list(script_words[current_word_index:current_word_index+len(text_words)]) == text_words:
+                    # Auto-generated segment that follows on directly: no need to search
+                    start_time = current_word_index / words_per_second
+                    seg_duration = len(text_words) / words_per_second
+                    current_word_index += len(text_words)
+                elif len(text_words) > 0:
                     # Try to find where this text appears in script
-                    for i in range(current_word_index, len(script_words) - len(text_words) + 1):
-                        if script_words[i:i+len(text_words)] == text_words:
+                    candidates = word_positions.get(text_words[0], ())
+                    last_start = len(script_words) - len(text_words)
+                    for i in candidates[bisect_left(candidates, current_word_index):]:
+                        if i > last_start:
+                            break
+                        if list(script_words[i:i+len(text_words)]) == text_words:
                             # Found it! Calculate exact timing
                             start_time = i / words_per_second
                             seg_duration = len(text_words) / words_per_second
@@ -381,17 +581,20 @@ class MediaGenerator:
                     is_hook=False  # is_hook=False will use 110px automatically
                 )
                 if text_clip:
-                    clips.append(text_clip.set_start(start_time))
+                    overlays.append((start_time, text_clip))
                     text_clips_created += 1
                     logger.info(f"Text clip {idx+1} created successfully")
                 else:
                     logger.error(f"Failed to create text clip {idx+1} for: {text[:30]}")
         
         logger.info(f"Created {text_clips_created} text clips out of {len(on_screen_texts)} segments")
-        logger.info(f"Total clips to composite: {len(clips)}")
         
-        # Composite all clips
+        # Composite the background with a single track holding every overlay
         try:
+            clips = [background]
+            if overlays:
+                clips.append(self._merge_overlays(overlays, duration))
+            logger.info(f"Total clips to composite: {len(clips)} ({len(overlays)} overlays merged into one track)")
             final = CompositeVideoClip(clips, size=(self.width, self.height))
             logger.info("Text overlays composited successfully")
             return final
@@ -402,6 +605,126 @@ class MediaGenerator:
             # Return background only if composition fails
             return background
     
+    def _prerender_text(self, content: Dict, duration: float):
+        """Rasterize the hook and on-screen text ahead of _add_text_overlays (fills the _rasterize_text cache)"""
+        try:
+            font_hook, font_main = self._get_fonts()
+            texts = [(content.get("hook", ""), font_hook, True)]
+            segments = content.get("on_screen_text", []) or self._auto_generate_text_segments(content.get("script", ""), duration)
+            texts += [(seg.get("text", "").strip(), font_main, False) for seg in segments]
+            # Stay within the cache size so warming never evicts its own entries
+            for text, font, is_hook in [t for t in texts if t[0]][:_rasterize_text.cache_parameters()["maxsize"]]:
+                _rasterize_text(text, font, is_hook, self.width, self.height)
+        except Exception as e:
+            logger.debug(f"Text prerender skipped: {e}")
+    
+    def _merge_overlays(self, overlays: List, duration: float) -> VideoClip:
+        """Flatten timed text clips into one RGB track plus mask, so each frame blends two layers instead of N"""
+        layers = []
+        for start, clip in overlays:
+            alpha = clip.mask.img if clip.mask is not None else np.ones(clip.img.shape[:2])
+            layers.append((start, start + clip.duration, clip.img, alpha))
+        
+        blank_rgb = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        blank_alpha = np.zeros((self.height, self.width))
+        flattened = {}
+        
+        def frame_at(t):
+            # Overlays rarely overlap, so this is almost always a single layer or none
+            active = tuple(i for i, (start, end, _, _) in enumerate(layers) if start <= t < end)
+            if active not in flattened:
+                if not active:
+                    flattened[active] = (blank_rgb, blank_alpha)
+                elif len(active) == 1:
+                    flattened[active] = layers[active[0]][2:]
+                else:
+                    # Later overlays are drawn over earlier ones, as CompositeVideoClip would
+                    premultiplied = np.zeros((self.height, self.width, 3))
+                    alpha = np.zeros((self.height, self.width))
+                    for i in active:
+                        layer_rgb, layer_alpha = layers[i][2:]
+                        premultiplied = layer_rgb * layer_alpha[:, :, None] + premultiplied * (1 - layer_alpha[:, :, None])
+                        alpha = layer_alpha + alpha * (1 - layer_alpha)
+                    rgb = np.divide(premultiplied, alpha[:, :, None], out=np.zeros_like(premultiplied), where=alpha[:, :, None] > 0)
+                    flattened[active] = (np.clip(np.rint(rgb), 0, 255).astype(np.uint8), alpha)
+            return flattened[active]
+        
+        track = VideoClip(lambda t: frame_at(t)[0], duration=duration)
+        mask = VideoClip(lambda t: frame_at(t)[1], ismask=True, duration=duration)
+        return track.set_mask(mask)
+    
+    def _get_fonts(self):
+        """Resolve hook/main fonts once per generator (directory probing and TTF parsing are skipped afterwards)"""
+        if self._font_cache:
+            return self._font_cache
+        
+        # Load better fonts (try bold first, then custom fonts)
+        font_hook = None
+        font_main = None
+        font_hook_size = 150  # Track font sizes explicitly
+        font_main_size = 110
+        
+        try:
+            # Try custom fonts from assets/fonts first
+            custom_fonts = list(config.FONTS_DIR.glob("*.ttf"))
+            if custom_fonts:
+                try:
+                    font_path = str(custom_fonts[0])
+                    logger.info(f"Using custom font: {font_path}")
+                    # Much larger fonts for better readability on mobile screens (9:16 vertical format)
+                    font_hook = _load_truetype(font_path, font_hook_size)  # 150px for hook
+                    font_main = _load_truetype(font_path, font_main_size)  # 110px for main text
+                    logger.info(f"Font sizes: hook={font_hook_size}px, main={font_main_size}px")
+                except Exception as e:
+                    logger.warning(f"Failed to load custom font: {e}")
+            
+            # Fallback to system fonts
+            if not font_hook:
+                font_paths = [
+                    "C:/Windows/Fonts/arialbd.ttf",  # Arial Bold
+                    "C:/Windows/Fonts/calibrib.ttf",  # Calibri Bold
+                    "C:/Windows/Fonts/arial.ttf",     # Arial Regular
+                ]
+                
+                for path in font_paths:
+                    if os.path.exists(path):
+                        try:
+                            # Much larger fonts for better readability on mobile screens
+                            font_hook = _load_truetype(path, font_hook_size)  # 150px for hook
+                            font_main = _load_truetype(path, font_main_size)   # 110px for main text
+                            logger.info(f"Using system font: {path} (size: hook={font_hook_size}px, main={font_main_size}px)")
+                            break
+                        except Exception as e:
+                            logger.warning(f"Failed to load {path}: {e}")
+                            continue
+            
+            if not font_hook:
+                # Default font is very small, try to scale it up
+                try:
+                    # Try to get a larger default font
+                    default_font = ImageFont.load_default()
+                    # For default font, we'll need to use a workaround since it doesn't support size
+                    font_hook = default_font
+                    font_main = default_font
+                    font_hook_size = 20  # Default font is very small
+                    font_main_size = 16
+                    logger.warning("Using default font (very small - consider adding custom fonts)")
+                except:
+                    font_hook = ImageFont.load_default()
+                    font_main = ImageFont.load_default()
+                    font_hook_size = 20
+                    font_main_size = 16
+                    logger.warning("Using default font (very small - consider adding custom fonts)")
+        except Exception as e:
+            logger.error(f"Error loading fonts: {e}")
+            font_hook = ImageFont.load_default()
+            font_main = ImageFont.load_default()
+            font_hook_size = 20
+            font_main_size = 16
+        
+        self._font_cache = (font_hook, font_main)
+        return self._font_cache
+    
     def _create_animated_text_clip(self, text: str, font: ImageFont.FreeTypeFont, duration: float, 
                                    width: int, height: int, animation_type: str = 'fade',
                                    is_hook: bool = False) -> Optional[ImageClip]:
@@ -420,79 +743,12 @@ class MediaGenerator:
             
             logger.info(f"Creating text clip: is_hook={is_hook}, duration={duration_val:.2f}s")
             
-            # STEP 2: Create image with text
-            img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            # STEP 3: Word wrap text
-            words = text.split()
-            lines = []
-            current_line = []
-            max_width = width - 200
-            
-            for word in words:
-                test_line = ' '.join(current_line + [word])
-                bbox = draw.textbbox((0, 0), test_line, font=font)
-                text_width = bbox[2] - bbox[0]
-                
-                if text_width <= max_width:
-                    current_line.append(word)
-                else:
-                    if current_line:
-                        lines.append(' '.join(current_line))
-                    current_line = [word]
-            
-            if current_line:
-                lines.append(' '.join(current_line))
-            
-            # STEP 4: Set colors
-            if is_hook:
-                text_color = (255, 255, 0, 255)
-                outline_color = (0, 0, 0, 255)
-                outline_width = 4
-            else:
-                text_color = (255, 255, 255, 255)
-                outline_color = (0, 0, 0, 255)
-                outline_width = 3
-            
-            # STEP 5: Calculate positions - ALL HARDCODED, NO MULTIPLICATION
-            if is_hook:
-                line_height_num = 225  # Hardcoded
-            else:
-                line_height_num = 165  # Hardcoded
+            # STEPS 2-6: Word wrap, outline and draw the text as 8-bit masks (cached for repeated strings)
+            text_rgb, fill, alpha = _rasterize_text(text, font, is_hook, width, height)
             
-            num_lines = len(lines)
-            total_height_num = num_lines * line_height_num  # Both are integers
-            start_y_num = (height - total_height_num) // 2 - 100
-            
-            # STEP 6: Draw text
-            for line_idx in range(num_lines):
-                line = lines[line_idx]
-                bbox = draw.textbbox((0, 0), line, font=font)
-                text_width = bbox[2] - bbox[0]
-                x = (width - text_width) // 2
-                y = start_y_num + (line_idx * line_height_num)  # All integers
-                
-                # Draw outline
-                for adj in range(-outline_width, outline_width + 1):
-                    for adj2 in range(-outline_width, outline_width + 1):
-                        if adj != 0 or adj2 != 0:
-                            draw.text((x + adj, y + adj2), line, font=font, fill=outline_color)
-                
-                # Draw main text
-                draw.text((x, y), line, font=font, fill=text_color)
-            
-            # STEP 7: Save image
-            temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-            img.save(temp_file.name, 'PNG')
-            temp_file.close()
-            
-            # STEP 8: Create clip - NO FADE, SIMPLE APPROACH
-            clip = ImageClip(temp_file.name, duration=duration_val)
-            
-            # STEP 9: Clean up
-            import atexit
-            atexit.register(lambda: os.unlink(temp_file.name) if os.path.exists(temp_file.name) else None)
+            # STEP 7: Create clip from the colorized fill with the alpha mask - NO FADE, SIMPLE APPROACH
+            clip = ImageClip(_text_pixels(text_rgb, fill), duration=duration_val)
+            clip = clip.set_mask(ImageClip(alpha / 255.0, ismask=True, duration=duration_val))
             
             logger.info(f"Text clip created successfully: '{text[:30]}...'")
             return clip
@@ -509,38 +765,17 @@ class MediaGenerator:
     
     def _auto_generate_text_segments(self, script: str, duration: float) -> List[Dict]:
         """Auto-generate text segments with perfect timing based on word positions"""
-        import re
-        
-        # Split into sentences, but keep track of word positions
-        sentences = re.split(r'([.!?]+)', script)
-        # Reconstruct sentences with punctuation
-        clean_sentences = []
-        for i in range(0, len(sentences) - 1, 2):
-            if i + 1 < len(sentences):
-                clean_sentences.append((sentences[i] + sentences[i+1]).strip())
-            else:
-                clean_sentences.append(sentences[i].strip())
-        
-        clean_sentences = [s for s in clean_sentences if s]
+        # Sentences with their word positions, from a single pass over the script
+        script_words, sentences = _segment_script(script)
         
         segments = []
         current_time = 3.5  # Start after hook (3.5 seconds)
         words_per_second = 2.5
         
-        # Track word position in full script
-        script_words = script.split()
-        current_word_index = 0
-        
-        for sentence in clean_sentences:
+        for sentence, current_word_index, word_count in sentences:
             if current_time >= duration:
                 break
             
-            sentence_words = sentence.split()
-            word_count = len(sentence_words)
-            
-            if word_count == 0:
-                continue
-            
             # Calculate exact duration based on word count
             seg_duration = word_count / words_per_second
             seg_duration = max(2.0, min(6.0, seg_duration))  # Min 2s, max 6s
@@ -558,10 +793,10 @@ class MediaGenerator:
                 segments.append({
                     "text": sentence[:100],  # Allow longer text
                     "duration": seg_duration,
-                    "start_time": start_time
+                    "start_time": start_time,
+                    "word_start": current_word_index
                 })
                 
-                current_word_index += word_count
                 current_time = start_time + seg_duration
             else:
                 # Fallback if we can't find position
@@ -585,9 +820,9 @@ class MediaGenerator:
         
         # Try to load font
         try:
-            if config.FONT_PATH.exists():
-                font_large = ImageFont.truetype(str(config.FONT_PATH), 100)  # Increased from 80 to 100
-                font_small = ImageFont.truetype(str(config.FONT_PATH), 70)  # Increased from 50 to 70
+            if config.FONT_PATH_EXISTS:
+                font_large = _load_truetype(str(config.FONT_PATH), 100)  # Increased from 80 to 100
+                font_small = _load_truetype(str(config.FONT_PATH), 70)  # Increased from 50 to 70
             else:
                 font_large = ImageFont.load_default()
                 font_small = ImageFont.load_default()
@@ -595,21 +830,8 @@ class MediaGenerator:
             font_large = ImageFont.load_default()
             font_small = ImageFont.load_default()
         
-        # Draw title (wrapped)
-        words = title.split()
-        lines = []
-        current_line = []
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = draw.textbbox((0, 0), test_line, font=font_large)
-            if bbox[2] - bbox[0] < self.width - 100:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
-        if current_line:
-            lines.append(' '.join(current_line))
+        # Draw title (wrapped; lines must be strictly narrower than width - 100)
+        lines = _wrap_words(draw, title, font_large, self.width - 101)
         
         # Draw lines
         y = (self.height - len(lines) * 100) // 2
@@ -3,21 +3,89 @@ Media generator for 20-second YouTube Shorts bulletin videos
 Creates videos with top 5 news items displayed as a bulletin with trending audio
 """
 import os
+import functools
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from loguru import logger
 import config
+from utils import mark_asset_used
+from ffmpeg_utils import has_nvenc, has_vaapi, mux_copy, overlay_video, vaapi_params
 from moviepy.editor import (
-    VideoFileClip, ImageClip, CompositeVideoClip,
-    AudioFileClip, concatenate_videoclips, ColorClip
+    VideoClip, VideoFileClip, ImageClip, CompositeVideoClip,
+    concatenate_videoclips, ColorClip
 )
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+import PIL
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
-import tempfile
 import requests
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
 from io import BytesIO
 
+# Seconds over which the bulletin overlay fades in from black
+OVERLAY_FADE_IN = 0.5
+
+# x264 scales close to linearly up to about 8 threads on short clips
+ENCODE_THREADS = min(8, os.cpu_count() or 4)
+
+# Directory listings keyed by (directory, suffixes), as (directory mtime, files)
+_listing_cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[float, List[Path]]] = {}
+
+def _list_files(directory: Path, suffixes: Tuple[str, ...]) -> List[Path]:
+    """Files in a directory ending in one of suffixes, rescanned only when the directory's mtime changes"""
+    try:
+        mtime = os.stat(directory).st_mtime
+    except OSError:
+        return []
+    key = (str(directory), suffixes)
+    cached = _listing_cache.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with os.scandir(directory) as entries:
+        files = [Path(entry.path) for entry in entries
+                 if entry.name.endswith(suffixes) and not entry.name.startswith('.') and entry.is_file()]
+    _listing_cache[key] = (mtime, files)
+    return files
+
+@functools.lru_cache(maxsize=32)
+def _load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Parse a TrueType font once per (path, size)"""
+    return ImageFont.truetype(path, size)
+
+@functools.lru_cache(maxsize=8)
+def _bulletin_fonts(font_path: Optional[str]) -> Tuple:
+    """Title, number and header fonts, falling back to arial and then Pillow's default (resolved once per font file)"""
+    for path in (font_path, "arial.ttf"):
+        if not path:
+            continue
+        try:
+            return _load_font(path, 60), _load_font(path, 50), _load_font(path, 80)  # Title larger (was 50)
+        except Exception:
+            continue
+    default = ImageFont.load_default()
+    return default, default, default
+
+@functools.lru_cache(maxsize=64)
+def _probe_duration(path: str, size: int) -> float:
+    """Duration of a background video, parsed once per (path, file size)"""
+    # Keyed on size rather than mtime, since mark_asset_used touches Drive files' mtimes on every use
+    return ffmpeg_parse_infos(path)['duration']
+
+def _background_duration(path: str) -> float:
+    """Duration of a background video without opening a decoder for it"""
+    return _probe_duration(path, os.path.getsize(path))
+
+def _load_background(path: str, width: int, height: int) -> VideoFileClip:
+    """Open a background video for MoviePy; its audio is never used, so skip the audio reader (close it when done)"""
+    # ffmpeg scales frames while decoding, so they arrive at the output size
+    return VideoFileClip(path, audio=False, target_resolution=(height, width))
+
 class BulletinMediaGenerator:
     """Generate 20-second bulletin videos for YouTube Shorts"""
     
@@ -27,6 +95,9 @@ class BulletinMediaGenerator:
         self.fps = config.VIDEO_FPS
         self.target_duration = 20.0  # 20 seconds for Shorts
         
+        # pillow-simd versions carry a .postN suffix
+        logger.debug(f"Pillow {PIL.__version__}{' (SIMD build)' if '.post' in PIL.__version__ else ''}")
+        
         # Ensure output directory exists
         config.MEDIA_DIR.mkdir(parents=True, exist_ok=True)
     
@@ -39,46 +110,42 @@ class BulletinMediaGenerator:
             return None
         
         try:
-            # Step 1: Load audio (MUST have audio - no silent fallback)
-            logger.info(f"Loading background music: {audio_path}")
-            audio_clip = AudioFileClip(audio_path)
+            # Step 1: Background music is muxed in by ffmpeg at the end (looped or trimmed there, never decoded here)
+            logger.info(f"Using background music: {audio_path}")
             
-            # Trim or loop to exactly 20 seconds
-            if audio_clip.duration < self.target_duration:
-                # Loop audio if shorter
-                loops_needed = int(self.target_duration / audio_clip.duration) + 1
-                audio_clips = [audio_clip] * loops_needed
-                audio_clip = concatenate_videoclips(audio_clips).subclip(0, self.target_duration)
-                logger.info(f"Looped audio to match {self.target_duration}s duration")
-            else:
-                audio_clip = audio_clip.subclip(0, self.target_duration)
-                logger.info(f"Trimmed audio to {self.target_duration}s")
+            import time
+            # pid keeps names unique when several bulletins render at once (generate_bulletin_videos)
+            output_path = config.MEDIA_DIR / f"bulletin_video_{int(time.time())}_{os.getpid()}.mp4"
+            
+            # Step 2: Pick the background; background videos are composited entirely in ffmpeg
+            bg_path = self._background_path()
+            if bg_path and self._render_with_ffmpeg(bg_path, news_items, audio_path, output_path):
+                logger.info(f"Bulletin video generated successfully: {output_path}")
+                return str(output_path)
             
-            # Step 2: Create background (20 seconds)
-            background = self._create_background(self.target_duration)
+            # Otherwise create the background (20 seconds) in MoviePy
+            background = self._create_background(self.target_duration, bg_path)
             
             # Step 3: Add news bulletin text overlays
             video_with_text = self._add_bulletin_text(background, news_items, self.target_duration)
             
-            # Step 4: Add audio (MUST have audio)
-            final_video = video_with_text.set_audio(audio_clip)
-            
-            # Step 5: Export video
-            import time
-            output_path = config.MEDIA_DIR / f"bulletin_video_{int(time.time())}.mp4"
-            final_video.write_videofile(
-                str(output_path),
-                fps=self.fps,
-                codec='libx264',
-                audio_codec='aac',
-                preset='medium',
-                bitrate='5000k'
-            )
+            # Step 4: Export the silent video
+            video_path = output_path.with_name(f"{output_path.stem}_video.mp4")
+            self._write_video(video_with_text, str(video_path))
             
             # Cleanup
-            audio_clip.close()
-            final_video.close()
+            video_with_text.close()
             background.close()
+            self._close_background_source()
+            
+            # Step 5: Add audio (MUST have audio), looped or trimmed to exactly 20 seconds
+            try:
+                muxed = mux_copy(str(video_path), audio_path, str(output_path), self.target_duration, loop_audio=True)
+            finally:
+                video_path.unlink(missing_ok=True)
+            if not muxed:
+                logger.error("Could not add background music - cannot create video without audio")
+                return None
             
             logger.info(f"Bulletin video generated successfully: {output_path}")
             return str(output_path)
@@ -87,10 +154,141 @@ class BulletinMediaGenerator:
             logger.error(f"Error generating bulletin video: {e}")
             import traceback
             logger.error(traceback.format_exc())
+            self._close_background_source()
             return None
     
-    def _create_background(self, duration: float) -> VideoFileClip:
+    def _render_with_ffmpeg(self, bg_path: str, news_items: List[Dict], audio_path: str, output_path: Path) -> bool:
+        """Overlay the bulletin image on a background video, and add the music, in a single ffmpeg run"""
+        try:
+            bg_duration = _background_duration(bg_path)
+        except Exception as e:
+            logger.error(f"Failed to open background {os.path.basename(bg_path)}: {e}")
+            return False
+        
+        # Same fitting as _process_background_clip: slow short footage down, or loop it slightly slowed if very short
+        speed, loop, start = 1.0, False, 0.0
+        if bg_duration < self.target_duration:
+            speed = bg_duration / self.target_duration
+            if speed < 0.5:
+                speed, loop = 0.7, True
+        else:
+            # Start anywhere in longer footage for variety
+            start = random.uniform(0, bg_duration - self.target_duration)
+        
+        try:
+            img = self._draw_bulletin_image(news_items[:5], self._get_font_path())
+        except Exception as e:
+            logger.error(f"Error creating all bulletin items: {e}")
+            return False
+        
+        overlay_path = output_path.with_name(f"{output_path.stem}_overlay.png")
+        img.save(overlay_path, compress_level=1)
+        try:
+            # VAAPI needs its own -vf upload chain, so it stays on the MoviePy path
+            codecs = ['h264_nvenc'] if has_nvenc() else []
+            for codec in codecs + ['libx264']:
+                if overlay_video(bg_path, start, str(overlay_path), audio_path, str(output_path),
+                                 (self.width, self.height), self.target_duration, self.fps,
+                                 OVERLAY_FADE_IN, self._encoder_args(codec), speed, loop):
+                    logger.info(f"Bulletin composited in ffmpeg ({codec})")
+                    return True
+            return False
+        finally:
+            overlay_path.unlink(missing_ok=True)
+    
+    def generate_bulletin_videos(self, jobs: List[Tuple[List[Dict], str]], max_workers: int = None) -> List[Optional[str]]:
+        """Render several bulletins in parallel, one (news_items, audio_path) job per worker process"""
+        if not jobs:
+            return []
+        
+        # Each encode already runs several x264 threads, so use about half the cores
+        max_workers = min(max_workers or max(1, (os.cpu_count() or 2) // 2), len(jobs))
+        if max_workers == 1:
+            return [self.generate_bulletin_video(*job) for job in jobs]
+        
+        logger.info(f"Rendering {len(jobs)} bulletins in {max_workers} processes")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_render_one, *zip(*jobs)))
+    
+    def _encoder_settings(self, codec: str) -> Dict:
+        """write_videofile codec settings for a hardware (h264_nvenc/h264_vaapi) or libx264 encode"""
+        # moov atom up front for streaming; mostly static text, so a keyframe every 2 seconds is plenty
+        gop = str(2 * self.fps)
+        common = ['-movflags', '+faststart', '-g', gop]
+        if codec == 'h264_nvenc':
+            # moviepy only adds -pix_fmt yuv420p for libx264, so set it for NVENC too
+            return {
+                'codec': codec,
+                'preset': 'p4',
+                'ffmpeg_params': ['-rc', 'vbr', '-cq', str(config.BULLETIN_CRF), '-pix_fmt', 'yuv420p'] + common,
+            }
+        if codec == 'h264_vaapi':
+            return {
+                'codec': codec,
+                'ffmpeg_params': vaapi_params() + ['-qp', str(config.BULLETIN_CRF)] + common,
+            }
+        # Constant quality instead of a fixed bitrate; stillimage spends bits on the text edges
+        return {
+            'codec': 'libx264',
+            'preset': config.BULLETIN_X264_PRESET,
+            'threads': ENCODE_THREADS,
+            'ffmpeg_params': ['-crf', str(config.BULLETIN_CRF), '-tune', 'stillimage,fastdecode',
+                              '-keyint_min', gop] + common,
+        }
+    
+    def _encoder_args(self, codec: str) -> List[str]:
+        """_encoder_settings as ffmpeg command-line output options"""
+        settings = self._encoder_settings(codec)
+        args = ['-c:v', settings['codec']]
+        if 'preset' in settings:
+            args += ['-preset', settings['preset']]
+        if 'threads' in settings:
+            args += ['-threads', str(settings['threads'])]
+        return args + settings['ffmpeg_params']
+    
+    def _write_video(self, clip, output_path: str):
+        """Encode the bulletin on a GPU encoder when one is usable, falling back to libx264"""
+        codecs = [c for c, usable in (('h264_nvenc', has_nvenc), ('h264_vaapi', has_vaapi)) if usable()]
+        for codec in codecs + ['libx264']:
+            try:
+                clip.write_videofile(
+                    output_path,
+                    fps=self.fps,
+                    audio=False,  # Music is muxed in afterwards
+                    logger=None,  # No progress bar
+                    **self._encoder_settings(codec)
+                )
+                return
+            except Exception as e:
+                if codec == 'libx264':
+                    raise
+                logger.warning(f"{codec} encode failed ({e}), trying the next encoder")
+    
+    def _create_background(self, duration: float, bg_path: Optional[str] = None) -> VideoFileClip:
         """Create or get random background video (Drive > Local > Gradient)"""
+        # Opened background video, closed after the render (looped/concatenated clips don't close their sources)
+        self._bg_source = None
+        bg_path = bg_path or self._background_path()
+        if bg_path:
+            try:
+                self._bg_source = _load_background(bg_path, self.width, self.height)
+                return self._process_background_clip(self._bg_source, duration)
+            except Exception as e:
+                logger.error(f"Failed to open background {os.path.basename(bg_path)}: {e}")
+                self._close_background_source()
+            
+        # Step 3: Gradient Fallback
+        logger.info("No background videos found, creating gradient background")
+        return self._create_gradient_background(duration)
+    
+    def _close_background_source(self):
+        """Stop the ffmpeg reader of the background video opened by _create_background, if any"""
+        if getattr(self, "_bg_source", None) is not None:
+            self._bg_source.close()
+            self._bg_source = None
+    
+    def _background_path(self) -> Optional[str]:
+        """Pick a random background video (Drive > Local), or None for the gradient"""
         
         # Step 1: Try Google Drive (Primary)
         if config.DRIVE_BACKGROUNDS_FOLDER_ID:
@@ -98,9 +296,8 @@ class BulletinMediaGenerator:
                 # Check if we already have files downloaded recently to avoid spamming API? 
                 # For now, let's try to get a new one to ensure variety
                 logger.info("Checking Google Drive for background video...")
-                from google_drive_assets import GoogleDriveAssets
-                drive = GoogleDriveAssets()
-                drive_bg = drive.download_random_file(
+                from google_drive_assets import drive_assets
+                drive_bg = drive_assets.download_random_file(
                     config.DRIVE_BACKGROUNDS_FOLDER_ID,
                     str(config.BACKGROUNDS_DIR),
                     ['.mp4', '.mov']
@@ -108,30 +305,23 @@ class BulletinMediaGenerator:
                 
                 if drive_bg:
                     logger.info(f"Using background from Google Drive: {os.path.basename(drive_bg)}")
-                    bg_clip = VideoFileClip(drive_bg)
-                    return self._process_background_clip(bg_clip, duration)
+                    return drive_bg
             except Exception as e:
                 logger.error(f"Failed to get background from Drive: {e}")
 
         # Step 2: Local Backgrounds
-        bg_videos = list(config.BACKGROUNDS_DIR.glob("*.mp4"))
+        bg_videos = _list_files(config.BACKGROUNDS_DIR, (".mp4",))
         
         if bg_videos:
             # Use random background video
             bg_path = random.choice(bg_videos)
             logger.info(f"Using random background video: {bg_path.name}")
-            bg_clip = VideoFileClip(str(bg_path))
-            return self._process_background_clip(bg_clip, duration)
-            
-        # Step 3: Gradient Fallback
-        logger.info("No background videos found, creating gradient background")
-        return self._create_gradient_background(duration)
+            mark_asset_used(bg_path)
+            return str(bg_path)
+        return None
 
     def _process_background_clip(self, bg_clip: VideoFileClip, duration: float) -> VideoFileClip:
-        """Process a raw video clip to fit the target dimensions and duration"""
-        # Resize to 9:16
-        bg_clip = bg_clip.resize((self.width, self.height))
-        
+        """Fit a background clip (already decoded at the target size) to the target duration"""
         # Adjust duration to exactly 20 seconds
         if bg_clip.duration < duration:
             # Slow down or loop
@@ -157,8 +347,10 @@ class BulletinMediaGenerator:
                     looped_clips = [bg_clip] * loops_needed
                     bg_clip = concatenate_videoclips(looped_clips)
         
-        # Trim to exact duration
-        bg_clip = bg_clip.subclip(0, duration)
+        # Trim to exact duration, starting anywhere in longer footage for variety
+        # (MoviePy's reader seeks with -ss before -i, so frames before the start are never decoded)
+        start = random.uniform(0, bg_clip.duration - duration) if bg_clip.duration > duration else 0
+        bg_clip = bg_clip.subclip(start, start + duration)
         return bg_clip
     
     def _create_gradient_background(self, duration: float) -> VideoFileClip:
@@ -172,49 +364,36 @@ class BulletinMediaGenerator:
             c2 = random_color()
             c3 = random_color()
 
-            # Create base image
-            img = Image.new('RGB', (self.width, self.height), c1)
-            draw = ImageDraw.Draw(img)
-            
             logger.info(f"Creating gradient background with colors: {c1}, {c2}, {c3}")
             
-            # Create complex gradient
-            for y in range(self.height):
-                p = y / self.height
-                if p < 0.5:
-                    # Blend c1 -> c2
-                    ratio = p * 2
-                    r = int(c1[0] * (1-ratio) + c2[0] * ratio)
-                    g = int(c1[1] * (1-ratio) + c2[1] * ratio)
-                    b = int(c1[2] * (1-ratio) + c2[2] * ratio)
-                else:
-                    # Blend c2 -> c3
-                    ratio = (p - 0.5) * 2
-                    r = int(c2[0] * (1-ratio) + c3[0] * ratio)
-                    g = int(c2[1] * (1-ratio) + c3[1] * ratio)
-                    b = int(c2[2] * (1-ratio) + c3[2] * ratio)
-                
-                draw.line([(0, y), (self.width, y)], fill=(r, g, b))
-                
-            temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-            img.save(temp_file.name)
-            temp_file.close()
-            
-            clip = ImageClip(temp_file.name, duration=duration)
+            # Create complex gradient: blend one column of row colors, then broadcast across the width
+            p = (np.arange(self.height) / self.height)[:, None]
+            top = np.asarray(c1) * (1 - p * 2) + np.asarray(c2) * (p * 2)  # Blend c1 -> c2
+            bottom = np.asarray(c2) * (1 - (p - 0.5) * 2) + np.asarray(c3) * ((p - 0.5) * 2)  # Blend c2 -> c3
+            rows = np.where(p < 0.5, top, bottom).astype(np.float32)
             
             # Add slow movement/zoom
             # Randomly choose between zoom in, zoom out, or pan
             move_type = random.choice(['zoom_in', 'zoom_out', 'pan'])
             
+            # The gradient is constant across the width, so zooming or panning it only moves the one
+            # column of row colors: map each output row back to a source row instead of resizing the frame
+            y = np.arange(self.height, dtype=np.float32)
             if move_type == 'zoom_in':
-                clip = clip.resize(lambda t: 1 + 0.1 * t / duration)
+                source_rows = lambda t: y / (1 + 0.1 * t / duration)
             elif move_type == 'zoom_out':
-                clip = clip.resize(lambda t: 1.1 - 0.1 * t / duration)
-            else: # Pan (resize slightly larger then scroll)
-                clip = clip.resize(1.1)
-                clip = clip.set_position(lambda t: ('center', -10 * t))
+                source_rows = lambda t: y / (1.1 - 0.1 * t / duration)
+            else: # Pan (slightly larger, scrolling up 10px per second)
+                source_rows = lambda t: (y + 10 * t) / 1.1
             
-            return clip
+            def make_frame(t):
+                src = np.minimum(source_rows(t), self.height - 1)
+                i = np.minimum(src.astype(np.int32), self.height - 2)
+                frac = (src - i)[:, None]
+                column = (rows[i] * (1 - frac) + rows[i + 1] * frac).astype(np.uint8)
+                return self._widen(column)
+            
+            return VideoClip(make_frame, duration=duration)
             
         except Exception as e:
             logger.warning(f"Error creating gradient: {e}, using simple background")
@@ -222,6 +401,13 @@ class BulletinMediaGenerator:
             bg_color = (random.randint(10, 50), random.randint(10, 50), random.randint(30, 80))
             return ColorClip(size=(self.width, self.height), color=bg_color, duration=duration)
     
+    def _widen(self, column: np.ndarray) -> np.ndarray:
+        """Repeat a (height, 3) column of colors across the frame width"""
+        if cv2 is not None:
+            # Nearest-neighbour widening of the single column is a SIMD copy in OpenCV
+            return cv2.resize(column[:, None, :], (self.width, self.height), interpolation=cv2.INTER_NEAREST)
+        return np.ascontiguousarray(np.broadcast_to(column[:, None, :], (self.height, self.width, 3)))
+    
     def _add_bulletin_text(self, background: VideoFileClip, news_items: List[Dict], duration: float) -> CompositeVideoClip:
         """Add news bulletin text overlays - ALL items shown simultaneously for full duration"""
         clips = [background]
@@ -243,166 +429,187 @@ class BulletinMediaGenerator:
         )
         
         if all_items_clip:
-            clips.append(all_items_clip)
+            return self._composite_overlay(background, all_items_clip, duration)
         
         # Composite all clips
         final = CompositeVideoClip(clips, size=(self.width, self.height))
         return final
     
+    def _composite_overlay(self, background: VideoFileClip, overlay: ImageClip, duration: float) -> VideoClip:
+        """Blend the static overlay onto the background, with its premultiplied colors and inverse alpha computed once"""
+        alpha = np.asarray(overlay.mask.img, dtype=np.float32)[:, :, None]
+        premultiplied = overlay.img.astype(np.float32) * alpha
+        inverse_alpha = 1.0 - alpha
+        black = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        
+        def blend(t):
+            # Place the background as CompositeVideoClip would (gradient backgrounds zoom and pan)
+            frame = background.blit_on(black, t) * inverse_alpha
+            if t < OVERLAY_FADE_IN:
+                # Add subtle fade in at start (from black, like clip.fadein)
+                frame += premultiplied * (t / OVERLAY_FADE_IN)
+            else:
+                frame += premultiplied
+            return frame.astype(np.uint8)
+        
+        if not self._is_static(background, duration):
+            return VideoClip(blend, duration=duration)
+        
+        # Nothing changes once the fade is done, so blend that frame once
+        still = blend(OVERLAY_FADE_IN)
+        logger.info("Static background: bulletin frame composited once")
+        return VideoClip(lambda t: blend(t) if t < OVERLAY_FADE_IN else still, duration=duration)
+    
+    @staticmethod
+    def _is_static(clip, duration: float) -> bool:
+        """Whether every frame of a background clip is the same image at the same place (e.g. the ColorClip fallback)"""
+        # ImageClips keep returning their own img unless an effect (like a resize over time) replaced make_frame
+        return (isinstance(clip, ImageClip) and clip.mask is None
+                and clip.make_frame(0) is clip.img and clip.pos(0) == clip.pos(duration))
+    
     def _create_all_bulletin_items(self, news_items: List[Dict], duration: float, font_path: Optional[str]) -> Optional[ImageClip]:
         """Create a single image with all 5 news items displayed simultaneously"""
         try:
-            # Create image with all text
-            img = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
+            img = self._draw_bulletin_image(news_items, font_path)
             
-            # Load fonts - smaller size to fit all 5 items
-            try:
-                if font_path and os.path.exists(font_path):
-                    font_title = ImageFont.truetype(font_path, 60)  # Larger font (was 50)
-                    font_number = ImageFont.truetype(font_path, 50)
-                    font_header = ImageFont.truetype(font_path, 80)
-                else:
-                    # Try system fonts
-                    try:
-                        font_title = ImageFont.truetype("arial.ttf", 60)
-                        font_number = ImageFont.truetype("arial.ttf", 50)
-                        font_header = ImageFont.truetype("arial.ttf", 80)
-                    except:
-                        font_title = ImageFont.load_default()
-                        font_number = ImageFont.load_default()
-                        font_header = ImageFont.load_default()
-            except:
-                font_title = ImageFont.load_default()
-                font_number = ImageFont.load_default()
-                font_header = ImageFont.load_default()
+            # Split into RGB and a single-channel mask (float32, where MoviePy's own RGBA split makes float64)
+            rgb = np.asarray(img.convert('RGB'))
+            alpha = np.asarray(img.getchannel('A'), dtype=np.float32) / np.float32(255)
             
-            # --- Draw Header ---
-            header_text = "TOP 5 BREAKING NEWS"
-            bbox = draw.textbbox((0, 0), header_text, font=font_header)
-            header_w = bbox[2] - bbox[0]
+            # Create clip for entire duration (all items shown for full 20 seconds)
+            # The fade in is applied when compositing (_composite_overlay)
+            clip = ImageClip(rgb).set_duration(duration).set_position(('center', 'center'))
+            clip = clip.set_mask(ImageClip(alpha, ismask=True).set_duration(duration))
             
-            # Draw header background
-            draw.rectangle([0, 0, self.width, 140], fill=(200, 0, 0, 255)) # Red banner
-            draw.text(((self.width - header_w)/2, 30), header_text, fill="white", font=font_header, stroke_width=3, stroke_fill="black")
+            return clip
+            
+        except Exception as e:
+            logger.error(f"Error creating all bulletin items: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return None
+    
+    def _draw_bulletin_image(self, news_items: List[Dict], font_path: Optional[str]) -> Image.Image:
+        """Draw the header and all 5 news items onto one transparent RGBA image"""
+        # Create image with all text
+        img = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        
+        # Load fonts - smaller size to fit all 5 items
+        font_title, font_number, font_header = _bulletin_fonts(
+            font_path if font_path and os.path.exists(font_path) else None
+        )
+        
+        # --- Draw Header ---
+        header_text = "TOP 5 BREAKING NEWS"
+        header_w = font_header.getlength(header_text)
+        
+        # Draw header background
+        draw.rectangle([0, 0, self.width, 140], fill=(200, 0, 0, 255)) # Red banner
+        draw.text(((self.width - header_w)/2, 30), header_text, fill="white", font=font_header, stroke_width=3, stroke_fill="black")
 
-            # --- Calculate Layout ---
-            start_y = 180  # Top margin (below header)
-            item_height = (self.height - 300) // 5  # Available height / 5 items
+        # --- Calculate Layout ---
+        start_y = 180  # Top margin (below header)
+        item_height = (self.height - 300) // 5  # Available height / 5 items
+        
+        # Distribute evenly across the height (9:16 = 1080x1920)
+        # Leave margins: top 100px, bottom 100px, so 1720px available
+        # 5 items with spacing: each item gets ~344px height
+        
+        spacing = 20
+        
+        # Advance width of each "word " token, measured once across all headlines
+        word_widths = {}
+        
+        # Vibrant colors for numbers for eye-catching look
+        badge_colors = [(255, 59, 48), (255, 149, 0), (255, 204, 0), (52, 199, 89), (0, 122, 255)]
+        
+        # Lay out every item first, then draw each kind of primitive in its own pass
+        cards = []  # [x1, y1, x2, y2]
+        badges = []  # ([x1, y1, x2, y2], color)
+        numbers = []  # ((x, y), text)
+        title_lines = []  # ((x, y), line)
+        
+        for idx, news in enumerate(news_items):
+            news_number = idx + 1
+            title = news.get("title", "Breaking News")
             
-            # Distribute evenly across the height (9:16 = 1080x1920)
-            # Leave margins: top 100px, bottom 100px, so 1720px available
-            # 5 items with spacing: each item gets ~344px height
+            # Calculate position for this item
+            y_start = start_y + idx * (item_height + spacing)
+            y_center = y_start + item_height // 2
             
-            spacing = 20
+            # Glassmorphism card background for readability
+            card_height = item_height - 25
+            card_margin = 40
+            card_y = y_center - card_height // 2
+            cards.append([card_margin, card_y, self.width - card_margin, card_y + card_height])
             
-            for idx, news in enumerate(news_items):
-                news_number = idx + 1
-                title = news.get("title", "Breaking News")
-                
-                # Calculate position for this item
-                y_start = start_y + idx * (item_height + spacing)
-                y_center = y_start + item_height // 2
-                
-                # Draw glassmorphism card background for readability
-                card_height = item_height - 25
-                card_margin = 40
-                card_y = y_center - card_height // 2
-                
-                # Semi-transparent dark background for text readability
-                draw.rectangle(
-                    [card_margin, card_y, self.width - card_margin, card_y + card_height],
-                    fill=(0, 0, 0, 160),
-                    outline=(255, 255, 255, 30),
-                    width=2
-                )
-                
-                # Draw Colorful Number Badge (Left)
-                badge_size = 80
-                badge_x = card_margin + 50
-                badge_y = y_center
-                
-                # Vibrant colors for numbers for eye-catching look
-                badge_colors = [(255, 59, 48), (255, 149, 0), (255, 204, 0), (52, 199, 89), (0, 122, 255)]
-                badge_color = badge_colors[idx % len(badge_colors)]
-                
-                draw.ellipse(
-                    [badge_x - badge_size//2, badge_y - badge_size//2, 
-                     badge_x + badge_size//2, badge_y + badge_size//2],
-                    fill=badge_color
-                )
-                
-                # Draw number centered in badge
-                # Use thicker stroke for bold look
-                number_text = str(news_number)
-                bbox = draw.textbbox((0, 0), number_text, font=font_number)
-                num_w, num_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-                draw.text(
-                    (badge_x - num_w/2, badge_y - num_h/2 - 5), 
-                    number_text, 
-                    fill="white", 
-                    font=font_number,
-                    stroke_width=2,
-                    stroke_fill="black"
-                )
-                
-                # Draw Title (Right)
-                text_x = badge_x + 70
-                max_text_width = self.width - text_x - card_margin - 30
-                
-                # Word wrap logic
-                words = title.split()
-                lines = []
-                current_line = []
-                current_w = 0
-                
-                for word in words:
-                    bbox = draw.textbbox((0, 0), word + " ", font=font_title)
-                    w = bbox[2] - bbox[0]
-                    if current_w + w > max_text_width:
-                        lines.append(" ".join(current_line))
-                        current_line = [word]
-                        current_w = w
-                    else:
-                        current_line.append(word)
-                        current_w += w
-                if current_line: lines.append(" ".join(current_line))
-                
-                # Center vertically based on number of lines
-                total_text_height = len(lines) * 60
-                text_start_y = y_center - total_text_height // 2
-                
-                for i, line in enumerate(lines):
-                    draw.text(
-                        (text_x, text_start_y + i * 60),
-                        line,
-                        fill="white",
-                        font=font_title,
-                        stroke_width=2,
-                        stroke_fill="black"
-                    )
+            # Colorful Number Badge (Left)
+            badge_size = 80
+            badge_x = card_margin + 50
+            badge_y = y_center
+            badges.append((
+                [badge_x - badge_size//2, badge_y - badge_size//2,
+                 badge_x + badge_size//2, badge_y + badge_size//2],
+                badge_colors[idx % len(badge_colors)]
+            ))
             
-            # Convert to numpy array
-            img_array = np.array(img)
+            # Number centered in badge
+            number_text = str(news_number)
+            bbox = font_number.getbbox(number_text)  # Same box as draw.textbbox at (0, 0)
+            num_w, num_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+            numbers.append(((badge_x - num_w/2, badge_y - num_h/2 - 5), number_text))
             
-            # Create clip for entire duration (all items shown for full 20 seconds)
-            clip = ImageClip(img_array).set_duration(duration).set_position(('center', 'center'))
+            # Title (Right)
+            text_x = badge_x + 70
+            max_text_width = self.width - text_x - card_margin - 30
             
-            # Add subtle fade in at start
-            clip = clip.fadein(0.5)
+            # Word wrap logic
+            words = title.split()
+            lines = []
+            current_line = []
+            current_w = 0
             
-            return clip
+            for word in words:
+                w = word_widths.get(word)
+                if w is None:
+                    w = word_widths[word] = font_title.getlength(word + " ")
+                if current_w + w > max_text_width:
+                    lines.append(" ".join(current_line))
+                    current_line = [word]
+                    current_w = w
+                else:
+                    current_line.append(word)
+                    current_w += w
+            if current_line: lines.append(" ".join(current_line))
             
-        except Exception as e:
-            logger.error(f"Error creating all bulletin items: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return None
+            # Center vertically based on number of lines
+            total_text_height = len(lines) * 60
+            text_start_y = y_center - total_text_height // 2
+            title_lines.extend(((text_x, text_start_y + i * 60), line) for i, line in enumerate(lines))
+        
+        # Semi-transparent dark cards for text readability
+        rectangle = draw.rectangle
+        for box in cards:
+            rectangle(box, fill=(0, 0, 0, 160), outline=(255, 255, 255, 30), width=2)
+        
+        ellipse = draw.ellipse
+        for box, color in badges:
+            ellipse(box, fill=color)
+        
+        # Numbers and titles use a thicker stroke for a bold look
+        text = draw.text
+        for xy, number_text in numbers:
+            text(xy, number_text, fill="white", font=font_number, stroke_width=2, stroke_fill="black")
+        for xy, line in title_lines:
+            text(xy, line, fill="white", font=font_title, stroke_width=2, stroke_fill="black")
+        
+        return img
     
     def _get_font_path(self) -> Optional[str]:
         """Get font path, prioritizing custom fonts"""
         # Check custom fonts first
-        custom_fonts = list(config.FONTS_DIR.glob("*.ttf")) + list(config.FONTS_DIR.glob("*.otf"))
+        custom_fonts = _list_files(config.FONTS_DIR, (".ttf", ".otf"))
         if custom_fonts:
             return str(random.choice(custom_fonts))
         
@@ -420,3 +627,6 @@ class BulletinMediaGenerator:
         
         return None
 
+def _render_one(news_items: List[Dict], audio_path: str) -> Optional[str]:
+    """Render one bulletin in a worker process (clips and ffmpeg readers are created there, never pickled)"""
+    return BulletinMediaGenerator().generate_bulletin_video(news_items, audio_path)
@@ -2,14 +2,16 @@
 News collection and ranking service
 Fetches trending news from multiple sources and ranks them by popularity
 """
+import functools
 import requests
 import feedparser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from fuzzywuzzy import fuzz
 from loguru import logger
 import config
-from database import NewsItem, SessionLocal
+from database import NewsItem, SessionLocal, db_session
 import time
 
 class NewsService:
@@ -100,21 +102,26 @@ class NewsService:
     def fetch_from_rss(self, rss_urls: List[str]) -> List[Dict]:
         """Fetch news from RSS feeds"""
         articles = []
-        
         for url in rss_urls:
-            try:
-                feed = feedparser.parse(url)
-                for entry in feed.entries[:10]:  # Limit per feed
-                    if entry.get("title") and entry.get("link"):
-                        articles.append({
-                            "title": entry["title"],
-                            "description": entry.get("description", ""),
-                            "url": entry["link"],
-                            "source": feed.feed.get("title", "RSS Feed"),
-                            "published_at": self._parse_date(entry.get("published", ""))
-                        })
-            except Exception as e:
-                logger.error(f"Error fetching RSS from {url}: {e}")
+            articles.extend(self._fetch_one_rss(url))
+        return articles
+    
+    def _fetch_one_rss(self, url: str) -> List[Dict]:
+        """Fetch news from a single RSS feed"""
+        articles = []
+        try:
+            feed = feedparser.parse(url)
+            for entry in feed.entries[:10]:  # Limit per feed
+                if entry.get("title") and entry.get("link"):
+                    articles.append({
+                        "title": entry["title"],
+                        "description": entry.get("description", ""),
+                        "url": entry["link"],
+                        "source": feed.feed.get("title", "RSS Feed"),
+                        "published_at": self._parse_date(entry.get("published", ""))
+                    })
+        except Exception as e:
+            logger.error(f"Error fetching RSS from {url}: {e}")
         
         return articles
     
@@ -140,20 +147,22 @@ class NewsService:
     
     def fetch_all_news(self) -> List[Dict]:
         """Fetch news from all configured sources"""
-        all_articles = []
-        
-        # Fetch from APIs
-        all_articles.extend(self.fetch_from_newsapi())
-        all_articles.extend(self.fetch_from_gnews())
-        
-        # Fetch from RSS feeds (popular news sources)
+        # RSS feeds (popular news sources)
         rss_urls = [
             "https://feeds.bbci.co.uk/news/rss.xml",
             "https://rss.cnn.com/rss/edition.rss",
             "https://feeds.reuters.com/reuters/topNews",
             "https://www.theguardian.com/world/rss"
         ]
-        all_articles.extend(self.fetch_from_rss(rss_urls))
+        
+        # Every source is a separate HTTP round trip, so fetch them all at once
+        # (results come back in source order: APIs first, then each feed)
+        tasks = [self.fetch_from_newsapi, self.fetch_from_gnews] + [
+            functools.partial(self._fetch_one_rss, url) for url in rss_urls
+        ]
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            results = list(executor.map(lambda fetch: fetch(), tasks))
+        all_articles = [article for articles in results for article in articles]
         
         # Remove duplicates based on URL
         seen_urls = set()
@@ -167,8 +176,8 @@ class NewsService:
         logger.info(f"Total unique articles fetched: {len(unique_articles)}")
         return unique_articles
     
-    def score_article(self, article: Dict, all_articles: List[Dict]) -> float:
-        """Score an article based on popularity metrics"""
+    def score_article(self, article: Dict, all_articles: List[Dict], similar_count: Optional[int] = None) -> float:
+        """Score an article based on popularity metrics (similar_count from _similar_counts skips the title comparisons)"""
         score = 0.0
         
         # Age factor (prefer recent news)
@@ -194,9 +203,10 @@ class NewsService:
             score += 2.0
         
         # Duplicate detection (penalize if similar to many others)
-        title = article.get("title", "").lower()
-        similar_count = sum(1 for a in all_articles 
-                          if fuzz.ratio(title, a.get("title", "").lower()) > 70)
+        if similar_count is None:
+            title = article.get("title", "").lower()
+            similar_count = sum(1 for a in all_articles 
+                              if fuzz.ratio(title, a.get("title", "").lower()) > 70)
         if similar_count > 3:
             score -= 5.0  # Too many similar articles
         
@@ -206,8 +216,8 @@ class NewsService:
         """Rank articles by score and filter"""
         # Score all articles
         scored_articles = []
-        for article in articles:
-            score = self.score_article(article, articles)
+        for article, similar_count in zip(articles, self._similar_counts(articles)):
+            score = self.score_article(article, articles, similar_count)
             article["score"] = score
             scored_articles.append(article)
         
@@ -226,6 +236,23 @@ class NewsService:
         # Return top N
         return filtered[:config.TOP_N_NEWS_TO_CONSIDER]
     
+    def _similar_counts(self, articles: List[Dict]) -> List[int]:
+        """How many articles (itself included) have a title similar to each one's (fuzz.ratio > 70)"""
+        titles = [a.get("title", "").lower() for a in articles]
+        counts = [1] * len(titles)  # Every title matches itself
+        for i, title in enumerate(titles):
+            for j in range(i + 1, len(titles)):
+                other = titles[j]
+                # The ratio can't exceed 200 * shorter / total length, so skip pairs whose lengths
+                # alone rule out a match (a rounded ratio above 70 needs at least 70.5)
+                if 200 * min(len(title), len(other)) < 70.5 * (len(title) + len(other)):
+                    continue
+                # Compare each pair once and credit both articles
+                if fuzz.ratio(title, other) > 70:
+                    counts[i] += 1
+                    counts[j] += 1
+        return counts
+    
     def get_top_news(self) -> List[Dict]:
         """Main method: fetch and return top news articles"""
         logger.info("Fetching news from all sources...")
@@ -243,48 +270,44 @@ class NewsService:
     
     def save_to_database(self, articles: List[Dict]) -> List[Dict]:
         """Save articles to database and return saved item info (with IDs)"""
-        db = SessionLocal()
         saved_items_info = []
         
         try:
-            for article in articles:
-                # Check if already exists
-                existing = db.query(NewsItem).filter_by(url=article["url"]).first()
-                if existing:
-                    # Return existing item info
+            with db_session() as db:
+                for article in articles:
+                    # Check if already exists
+                    existing = db.query(NewsItem).filter_by(url=article["url"]).first()
+                    if existing:
+                        # Return existing item info
+                        saved_items_info.append({
+                            "id": existing.id,
+                            "url": existing.url,
+                            "title": existing.title
+                        })
+                        continue
+                    
+                    news_item = NewsItem(
+                        title=article["title"],
+                        description=article.get("description", ""),
+                        url=article["url"],
+                        source=article.get("source", "Unknown"),
+                        published_at=article.get("published_at", datetime.utcnow()),
+                        score=article.get("score", 0.0)
+                    )
+                    db.add(news_item)
+                    db.flush()  # Flush to get the ID without committing
+                    
+                    # Extract ID before session closes
                     saved_items_info.append({
-                        "id": existing.id,
-                        "url": existing.url,
-                        "title": existing.title
+                        "id": news_item.id,
+                        "url": news_item.url,
+                        "title": news_item.title
                     })
-                    continue
-                
-                news_item = NewsItem(
-                    title=article["title"],
-                    description=article.get("description", ""),
-                    url=article["url"],
-                    source=article.get("source", "Unknown"),
-                    published_at=article.get("published_at", datetime.utcnow()),
-                    score=article.get("score", 0.0)
-                )
-                db.add(news_item)
-                db.flush()  # Flush to get the ID without committing
-                
-                # Extract ID before session closes
-                saved_items_info.append({
-                    "id": news_item.id,
-                    "url": news_item.url,
-                    "title": news_item.title
-                })
             
-            db.commit()
             logger.info(f"Saved {len(saved_items_info)} news items to database")
             
         except Exception as e:
-            db.rollback()
             logger.error(f"Error saving to database: {e}")
-        finally:
-            db.close()
         
         return saved_items_info
     
@@ -6,6 +6,7 @@ from loguru import logger
 from datetime import datetime
 from typing import Optional, Dict
 import config
+from sqlalchemy import insert
 from database import SessionLocal, NewsItem, Post, PublishLog, SystemLog
 from news_service import NewsService
 from content_generator import ContentGenerator
@@ -167,16 +168,21 @@ class Pipeline:
             
             # Step 7: Log publishing results
             logger.info("Step 7: Logging publish results...")
-            for platform, publish_result in publish_results.items():
-                publish_log = PublishLog(
-                    post_id=post.id,
-                    platform=platform,
-                    status=publish_result.get("status", "failed"),
-                    response=str(publish_result),
-                    posted_at=datetime.utcnow() if publish_result.get("status") == "success" else None,
-                    error_message=publish_result.get("error", "")
-                )
-                db.add(publish_log)
+            # One multi-row INSERT for all platforms instead of a round-trip per log
+            publish_logs = [
+                {
+                    "post_id": post.id,
+                    "platform": platform,
+                    "status": publish_result.get("status", "failed"),
+                    "response": str(publish_result),
+                    "posted_at": datetime.utcnow() if publish_result.get("status") == "success" else None,
+                    "error_message": publish_result.get("error", ""),
+                    "retry_count": 0
+                }
+                for platform, publish_result in publish_results.items()
+            ]
+            if publish_logs:
+                db.execute(insert(PublishLog), publish_logs)
             
             db.commit()
             
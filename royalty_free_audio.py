@@ -9,6 +9,7 @@ import requests
 from typing import Optional
 from loguru import logger
 import config
+from utils import mark_asset_used
 from pathlib import Path
 
 class RoyaltyFreeAudio:
@@ -33,9 +34,8 @@ class RoyaltyFreeAudio:
         if config.DRIVE_AUDIO_FOLDER_ID:
             logger.info("Checking Google Drive for audio...")
             try:
-                from google_drive_assets import GoogleDriveAssets
-                drive = GoogleDriveAssets()
-                drive_audio = drive.download_random_file(
+                from google_drive_assets import drive_assets
+                drive_audio = drive_assets.download_random_file(
                     config.DRIVE_AUDIO_FOLDER_ID, 
                     str(config.AUDIO_DIR),
                     ['.mp3', '.wav', '.m4a']
@@ -190,6 +190,7 @@ class RoyaltyFreeAudio:
             # Randomly select an audio file
             selected_audio = random.choice(available_files)
             logger.info(f"Selected random audio: {selected_audio.name} (from {len(audio_files)} available files)")
+            mark_asset_used(selected_audio)
             
             # Load and adjust duration if needed
             from moviepy.editor import AudioFileClip
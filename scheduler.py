@@ -68,6 +68,8 @@ class Scheduler:
                 time.sleep(60)
 
 if __name__ == "__main__":
+    config.ensure_dirs()
+    
     # Configure logging
     logger.add(
         config.LOGS_DIR / "scheduler_{time}.log",
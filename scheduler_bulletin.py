@@ -45,6 +45,7 @@ def run_job():
 
 def run_scheduler():
     """Main scheduler loop"""
+    config.ensure_dirs()
     logger.add(
         "logs/scheduler_bulletin_{time}.log",
         rotation="1 day",
@@ -114,3 +114,13 @@ def ensure_directory(path):
 
 
 
+
+def mark_asset_used(path) -> None:
+    """Mark a downloaded Drive asset (drive_*) as just used, for the local cache's LRU eviction"""
+    import os
+    # Eviction orders the cached files by mtime, so touching the file is the whole record
+    if os.path.basename(str(path)).startswith("drive_"):
+        try:
+            os.utime(path)
+        except OSError as e:
+            logger.debug(f"Could not mark {path} as used: {e}")